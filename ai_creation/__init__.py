@@ -18,11 +18,11 @@ from nonebot_plugin_alconna.uniseg import Image as UniImage
 
 from zhenxun.configs.utils import PluginExtraData, RegisterConfig
 from zhenxun.services.log import logger
-from zhenxun.utils.limiters import FreqLimiter
 
 from .config import base_config
+from .utils.limiter import PrunedFreqLimiter
 
-draw_limiter = FreqLimiter(base_config.get("draw_cd", 120))
+draw_limiter = PrunedFreqLimiter(base_config.get("draw_cd", 120))
 
 __plugin_meta__ = PluginMetadata(
     name="AI创作",
@@ -147,12 +147,24 @@ draw [附带图片] -o on 换成赛博朋克风格
                 value=True,
                 help="是否在豆包绘图时启用AI自动解决拖拽验证码。关闭后，遇到验证码将导致绘图失败。",
             ),
+            RegisterConfig(
+                module="ai_creation",
+                key="DOUBAO_KEEP_ALIVE",
+                value=False,
+                help="是否在等待豆包出图期间模拟滚动、鼠标移动等拟人化操作。开启后可能有助于规避风控，但会增加浏览器开销。",
+            ),
             RegisterConfig(
                 module="ai_creation",
                 key="browser_cooldown_seconds",
                 value=15,
                 help="浏览器关闭后的冷却时间（秒），冷却期间不接受新绘图请求",
             ),
+            RegisterConfig(
+                module="ai_creation",
+                key="doubao_browser_pool_size",
+                value=1,
+                help="豆包引擎同时运行的浏览器数量。大于1时可并发处理多个绘图任务（建议配置同等数量的Cookie），每个浏览器独立计算冷却时间。",
+            ),
             RegisterConfig(
                 module="ai_creation",
                 key="doubao_wait_signal_timeout",
@@ -319,11 +331,17 @@ async def _():
     try:
         cooldown = base_config.get("browser_cooldown_seconds")
         draw_queue_manager.set_browser_cooldown(cooldown)
+        await draw_queue_manager.set_browser_pool_size(
+            base_config.get("doubao_browser_pool_size", 1)
+        )
         await cookie_manager.load_and_sync_cookies()
         draw_queue_manager.start_idle_monitor()
         draw_queue_manager.start_queue_processor()
         await templates.template_manager.initialize()
-        logger.debug(f"AI Draw 插件核心服务已启动, 浏览器冷却时间: {cooldown}s")
+        logger.debug(
+            f"AI Draw 插件核心服务已启动, 浏览器冷却时间: {cooldown}s, "
+            f"浏览器池容量: {draw_queue_manager.browser_pool_size}"
+        )
     except Exception as e:
         logger.error(f"AI Draw 插件初始化失败: {e}")
 
@@ -331,11 +349,13 @@ async def _():
 @driver.on_shutdown
 async def ai_draw_shutdown():
     logger.debug("AI Draw Plugin: 正在关闭...")
+    from .engines.doubao.cookie_manager import cookie_manager
     from .engines.doubao.queue_manager import draw_queue_manager
 
     await draw_queue_manager.stop_idle_monitor()
     await draw_queue_manager.stop_queue_processor()
     await draw_queue_manager.shutdown_browser()
+    await cookie_manager.flush()
 
 
 from . import handlers  # noqa: E402, F401
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from importlib import import_module
 from typing import Any
 
 
@@ -18,17 +19,26 @@ class DrawEngine(ABC):
         raise NotImplementedError
 
 
+_ENGINE_REGISTRY: dict[str, tuple[str, str]] = {
+    "doubao": (".doubao", "DoubaoEngine"),
+    "api": (".llm_api", "LlmApiEngine"),
+}
+_ENGINE_INSTANCES: dict[str, DrawEngine] = {}
+
+
 def get_engine(engine_name: str) -> DrawEngine:
     """
-    绘图引擎工厂函数。
+    绘图引擎工厂函数。引擎均为无状态对象，每种引擎只实例化一次。
     """
     normalized_name = engine_name.lower()
-    if normalized_name == "doubao":
-        from .doubao import DoubaoEngine
+    if engine := _ENGINE_INSTANCES.get(normalized_name):
+        return engine
 
-        return DoubaoEngine()
-    if normalized_name == "api":
-        from .llm_api import LlmApiEngine
+    entry = _ENGINE_REGISTRY.get(normalized_name)
+    if entry is None:
+        raise ValueError(f"未知的绘图引擎: '{engine_name}'")
 
-        return LlmApiEngine()
-    raise ValueError(f"未知的绘图引擎: '{engine_name}'")
+    module_name, class_name = entry
+    engine_cls = getattr(import_module(module_name, __name__), class_name)
+    engine = _ENGINE_INSTANCES[normalized_name] = engine_cls()
+    return engine
@@ -1,9 +1,10 @@
+import asyncio
 from io import BytesIO
+import os
 from pathlib import Path
 import tempfile
 from typing import Any
 
-import aiofiles
 from PIL import Image
 
 from zhenxun.services.log import logger
@@ -13,6 +14,55 @@ from .exceptions import ImageGenerationError
 from .. import DrawEngine
 from .queue_manager import RequestStatus, draw_queue_manager
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8\xff"
+
+# 可直接上传、无需经过PIL转码的图片格式：(文件头, 临时文件后缀)
+PASSTHROUGH_FORMATS = ((PNG_SIGNATURE, ".png"), (JPEG_SIGNATURE, ".jpg"))
+
+
+def _may_be_animated(img_bytes: bytes) -> bool:
+    """根据文件头判断图片格式是否可能为动图（GIF/WebP）"""
+    return img_bytes.startswith(b"GIF8") or (
+        img_bytes.startswith(b"RIFF") and img_bytes[8:12] == b"WEBP"
+    )
+
+
+def _convert_to_png_file(img_bytes: bytes, path: str):
+    """将输入图片转换为PNG并直接写入指定文件（同步，供线程池调用）"""
+    with Image.open(BytesIO(img_bytes)) as img:
+        if _may_be_animated(img_bytes) and getattr(img, "is_animated", False):
+            logger.debug("检测到GIF动图，将提取第一帧并转换为PNG进行图生图。")
+            img.seek(0)
+
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        converted_img = img.convert("RGBA" if has_alpha else "RGB")
+        converted_img.save(path, format="PNG", compress_level=1)
+
+
+def _passthrough_suffix(img_bytes: bytes) -> str | None:
+    """若图片为可直接上传的格式，返回对应的文件后缀"""
+    for signature, suffix in PASSTHROUGH_FORMATS:
+        if img_bytes.startswith(signature):
+            return suffix
+    return None
+
+
+async def _save_input_image(img_bytes: bytes, upload_dir: Path) -> Path:
+    """将输入图片保存为临时文件（PNG/JPEG原样写入，其余格式转为PNG），返回文件路径"""
+    passthrough_suffix = _passthrough_suffix(img_bytes)
+    fd, temp_name = tempfile.mkstemp(suffix=passthrough_suffix or ".png", dir=upload_dir)
+    os.close(fd)
+    try:
+        if passthrough_suffix:
+            await asyncio.to_thread(Path(temp_name).write_bytes, img_bytes)
+        else:
+            await asyncio.to_thread(_convert_to_png_file, img_bytes, temp_name)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return Path(temp_name)
+
 
 class DoubaoEngine(DrawEngine):
     """使用 Playwright 模拟豆包网站的绘图引擎"""
@@ -39,36 +89,22 @@ class DoubaoEngine(DrawEngine):
             upload_dir = IMAGE_DIR
             upload_dir.mkdir(parents=True, exist_ok=True)
 
-            for i, img_bytes in enumerate(image_bytes):
-                try:
-                    with Image.open(BytesIO(img_bytes)) as img:
-                        if getattr(img, "is_animated", False):
-                            logger.debug(
-                                f"检测到第 {i + 1} 张图片为GIF，将提取第一帧并转换为PNG进行图生图。"
-                            )
-                            img.seek(0)
-
-                        converted_img = img.convert("RGBA")
-                        buffer = BytesIO()
-                        converted_img.save(buffer, format="PNG")
-                        png_image_bytes = buffer.getvalue()
-
-                    with tempfile.NamedTemporaryFile(
-                        delete=False,
-                        suffix=".png",
-                        dir=upload_dir,
-                    ) as temp_file:
-                        temp_file.write(png_image_bytes)
-                        temp_file_path = Path(temp_file.name)
-                        image_file_paths.append(temp_file_path)
-                        temp_files_to_clean.append(temp_file_path)
-                    logger.debug(
-                        f"图生图的第 {i + 1} 张输入图片已处理并保存为PNG: {temp_file_path}"
-                    )
-                except Exception as e:
+            conversion_results = await asyncio.gather(
+                *(_save_input_image(img_bytes, upload_dir) for img_bytes in image_bytes),
+                return_exceptions=True,
+            )
+
+            for i, temp_file_path in enumerate(conversion_results):
+                if isinstance(temp_file_path, BaseException):
                     logger.error(
-                        f"为豆包引擎创建或转换第 {i + 1} 张临时图片文件失败: {e}"
+                        f"为豆包引擎创建或转换第 {i + 1} 张临时图片文件失败: {temp_file_path}"
                     )
+                    continue
+                image_file_paths.append(temp_file_path)
+                temp_files_to_clean.append(temp_file_path)
+                logger.debug(
+                    f"图生图的第 {i + 1} 张输入图片已处理并保存: {temp_file_path}"
+                )
 
         image_paths_str = (
             [str(p) for p in image_file_paths] if image_file_paths else None
@@ -78,36 +114,39 @@ class DoubaoEngine(DrawEngine):
             "api_user", prompt_str, image_paths=image_paths_str
         )
 
-        draw_queue_manager.start_queue_processor()
-
-        completed_request = await draw_queue_manager.wait_for_request_completion(
-            request.request_id, timeout=600.0
-        )
-
-        for temp_path in temp_files_to_clean:
-            if temp_path.exists():
-                temp_path.unlink()
-
-        if not completed_request:
+        try:
+            await asyncio.wait_for(request.done_event.wait(), timeout=600.0)
+        except asyncio.TimeoutError:
             raise RuntimeError("请求处理超时")
+        finally:
+            for temp_path in temp_files_to_clean:
+                if temp_path.exists():
+                    temp_path.unlink()
 
-        if (
-            completed_request.status != RequestStatus.COMPLETED
-            or not completed_request.result
-        ):
-            error_msg = completed_request.error or "未知错误"
+        if request.status != RequestStatus.COMPLETED or not request.result:
+            error_msg = request.error or "未知错误"
             raise ImageGenerationError(error_msg)
 
-        structured_result = completed_request.result.get("structured_result", [])
+        # 取走结果后清空请求上的引用，归档的请求记录不再持有读入内存的图片数据
+        result, request.result = request.result, None
+        structured_result = result.get("structured_result", [])
         if not structured_result:
             raise ImageGenerationError("图片生成失败：未获取到任何内容")
 
-        for block in structured_result:
-            if block["type"] == "image":
-                image_bytes_list = []
-                for img_info in block.get("content", []):
-                    async with aiofiles.open(img_info["local_path"], "rb") as f:
-                        image_bytes_list.append(await f.read())
-                block["content"] = image_bytes_list
+        image_blocks = [
+            block for block in structured_result if block["type"] == "image"
+        ]
+        image_contents = await asyncio.gather(
+            *(
+                asyncio.to_thread(Path(img_info["local_path"]).read_bytes)
+                for block in image_blocks
+                for img_info in block.get("content", [])
+            )
+        )
+        offset = 0
+        for block in image_blocks:
+            count = len(block.get("content", []))
+            block["content"] = list(image_contents[offset : offset + count])
+            offset += count
 
         return structured_result
@@ -0,0 +1,118 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from zhenxun.services.log import logger
+
+from .generator import DoubaoImageGenerator
+
+
+@dataclass
+class BrowserSlot:
+    """浏览器池中的单个浏览器实例及其运行状态"""
+
+    slot_id: int
+    generator: DoubaoImageGenerator = field(default_factory=DoubaoImageGenerator)
+    in_use: bool = False
+    guest_usage_count: int = 0
+    last_release_time: float | None = None
+    last_activity_time: float | None = None
+
+    @property
+    def is_initialized(self) -> bool:
+        """浏览器是否已启动且页面可用"""
+        return self.generator.is_initialized
+
+    def cooldown_remaining(self, now: float, cooldown_seconds: float) -> float:
+        """根据给定的单调时钟时间计算该浏览器的冷却剩余时间（秒）"""
+        if self.last_release_time is None:
+            return 0.0
+        return max(0.0, cooldown_seconds - (now - self.last_release_time))
+
+    async def initialize(self) -> bool:
+        """启动该槽位的浏览器"""
+        logger.debug(f"正在初始化浏览器 #{self.slot_id}...")
+        return await self.generator.initialize()
+
+    async def shutdown(self):
+        """关闭该槽位的浏览器并重置会话状态"""
+        logger.debug(f"正在关闭浏览器 #{self.slot_id}...")
+        self.last_activity_time = None
+        self.guest_usage_count = 0
+        await self.generator.cleanup()
+
+
+class BrowserPool:
+    """豆包浏览器池，管理多个可被并发借用的浏览器实例"""
+
+    def __init__(self, size: int = 1):
+        self._slots: list[BrowserSlot] = []
+        self._idle_slots: asyncio.Queue[BrowserSlot] = asyncio.Queue()
+        self._grow_to(max(1, size))
+
+    @property
+    def size(self) -> int:
+        """浏览器池容量"""
+        return len(self._slots)
+
+    @property
+    def slots(self) -> tuple[BrowserSlot, ...]:
+        """池中所有槽位（只读视图）"""
+        return tuple(self._slots)
+
+    def _grow_to(self, size: int):
+        while len(self._slots) < size:
+            slot = BrowserSlot(slot_id=len(self._slots) + 1)
+            self._slots.append(slot)
+            self._idle_slots.put_nowait(slot)
+
+    async def resize(self, size: int):
+        """调整浏览器池容量，仅可在没有浏览器被借用时调用"""
+        size = max(1, size)
+        if any(slot.in_use for slot in self._slots):
+            raise RuntimeError("浏览器池中仍有浏览器在使用，无法调整容量。")
+
+        removed_slots = self._slots[size:]
+        self._slots = self._slots[:size]
+        # 沿用同一个队列对象，已在 acquire() 中等待的调用方不会因队列被替换而永久挂起
+        while not self._idle_slots.empty():
+            self._idle_slots.get_nowait()
+        for slot in self._slots:
+            self._idle_slots.put_nowait(slot)
+        self._grow_to(size)
+
+        for slot in removed_slots:
+            await slot.shutdown()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[BrowserSlot]:
+        """借用一个空闲浏览器，离开上下文时自动归还"""
+        slot = await self._idle_slots.get()
+        slot.in_use = True
+        try:
+            yield slot
+        finally:
+            slot.in_use = False
+            self._idle_slots.put_nowait(slot)
+
+    def cooldown_remaining(self, now: float, cooldown_seconds: float) -> float:
+        """获取最快可用的浏览器的冷却剩余时间（秒），所有浏览器都在处理任务时返回 0
+
+        已被工作协程借出但仍在等待冷却的浏览器同样计入。
+        """
+        return min(
+            (
+                remaining
+                for slot in self._slots
+                if (remaining := slot.cooldown_remaining(now, cooldown_seconds)) > 0
+                or not slot.in_use
+            ),
+            default=0.0,
+        )
+
+    async def shutdown_all(self):
+        """关闭池中所有浏览器"""
+        for slot in self._slots:
+            await slot.shutdown()
+        await DoubaoImageGenerator.shutdown_shared_browser()
@@ -1,7 +1,14 @@
 import asyncio
+import hashlib
+from io import BytesIO
 import random
 
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from PIL import Image
+from playwright.async_api import (
+    Error as PlaywrightError,
+    Page,
+    TimeoutError as PlaywrightTimeoutError,
+)
 from pydantic import BaseModel, Field
 
 from zhenxun.services.ai.llm.api import generate_structured
@@ -18,6 +25,10 @@ class CaptchaSolution(BaseModel):
 
     success: bool = Field(..., description="是否成功识别验证码内容")
     indices: list[int] = Field(..., description="需要拖动的图片的序号列表（从1开始）")
+    alternatives: list[list[int]] = Field(
+        default_factory=list,
+        description="把握不足时给出的其他候选序号列表，按可能性从高到低排列",
+    )
 
 
 CAPTCHA_SYSTEM_PROMPT = """
@@ -29,13 +40,15 @@ CAPTCHA_SYSTEM_PROMPT = """
 2.  **识别目标**：根据文字提示，识别出九宫格中所有匹配的图片。
 3.  **确定序号**：图片的序号遵循从左到右、从上到下的顺序，编号为 1 到 9。
 4.  **格式化输出**：将所有匹配图片的序号以JSON格式返回。
+5.  **备选答案**：如果对某些图片是否匹配没有把握，在 alternatives 中按可能性从高到低给出至多2组其他可能的序号组合；很有把握时返回空列表。
 
 【输出格式】
 严格按照以下JSON格式返回，不要包含任何额外的解释或代码块标记。
 
 {
     "success": true,
-    "indices": [序号1, 序号2, ...]
+    "indices": [序号1, 序号2, ...],
+    "alternatives": [[备选序号...], ...]
 }
 
 【示例】
@@ -43,10 +56,27 @@ CAPTCHA_SYSTEM_PROMPT = """
 - **输出**：
 {
     "success": true,
-    "indices": [1, 5, 8]
+    "indices": [1, 5, 8],
+    "alternatives": []
 }
 """
 
+CAPTCHA_IMAGE_MAX_SIZE = 512
+CAPTCHA_IMAGE_QUALITY = 85
+
+
+def _compress_screenshot(screenshot_bytes: bytes) -> bytes:
+    """将验证码截图缩放至长边不超过 512px 并转为 JPEG，减少上传体积与视觉token（同步，供线程池调用）"""
+    with Image.open(BytesIO(screenshot_bytes)) as img:
+        img.thumbnail(
+            (CAPTCHA_IMAGE_MAX_SIZE, CAPTCHA_IMAGE_MAX_SIZE), Image.Resampling.LANCZOS
+        )
+        buffer = BytesIO()
+        img.convert("RGB").save(
+            buffer, format="JPEG", quality=CAPTCHA_IMAGE_QUALITY, optimize=True
+        )
+        return buffer.getvalue()
+
 
 async def solve_drag_captcha_if_present(page: Page) -> bool:
     """
@@ -55,14 +85,23 @@ async def solve_drag_captcha_if_present(page: Page) -> bool:
     if not page:
         return False
 
+    captcha_container = page.locator("#captcha_container")
     try:
-        captcha_container = page.locator("#captcha_container")
-        await captcha_container.wait_for(state="visible", timeout=5000)
+        if not await captcha_container.count():
+            logger.info("未检测到验证码弹窗，流程继续。")
+            return False
+    except PlaywrightError as e:
+        logger.warning(f"检测验证码弹窗时页面不可用（可能正在跳转或已关闭）: {e}")
+        return False
+
+    try:
+        await captcha_container.wait_for(state="visible", timeout=1000)
 
         logger.info("检测到验证码，启动处理程序...")
         solved = False
+        candidate_cache: dict[str, list[list[int]]] = {}
         for i in range(3):
-            if await _solve_drag_captcha_attempt(page):
+            if await _solve_drag_captcha_attempt(page, candidate_cache):
                 solved = True
                 logger.debug("验证码解决后，等待图片生成流程继续...")
                 await asyncio.sleep(5)
@@ -81,10 +120,13 @@ async def solve_drag_captcha_if_present(page: Page) -> bool:
         return False
 
 
-async def _solve_drag_captcha_attempt(page: Page) -> bool:
+async def _solve_drag_captcha_attempt(
+    page: Page, candidate_cache: dict[str, list[list[int]]]
+) -> bool:
     """
     [内部方法] 执行单次解决拖拽验证码的尝试。
     假定被调用时验证码弹窗已经可见。
+    candidate_cache 保存同一道题目尚未尝试的备选答案，题目未变化时直接使用而不再调用LLM。
     """
     if not page:
         return False
@@ -105,74 +147,98 @@ async def _solve_drag_captcha_attempt(page: Page) -> bool:
         captcha_prompt = " ".join(captcha_prompt.split())
 
         captcha_box = captcha_frame.locator("#vc_captcha_box")
-        screenshot_bytes = await captcha_box.screenshot()
+        raw_screenshot = await captcha_box.screenshot()
+        screenshot_bytes = await asyncio.to_thread(_compress_screenshot, raw_screenshot)
 
         logger.debug(f"   - 验证码提示: '{captcha_prompt}'")
-        logger.debug(f"   - 已截取验证码区域图片 ({len(screenshot_bytes)} bytes)")
-
-        message = [
-            LLMMessage.user([
-                TextPart(text=f"问题是：'{captcha_prompt}'"),
-                ImagePart(raw=screenshot_bytes)
-            ])
-        ]
-        logger.debug("   - 正在调用Vision LLM分析验证码...")
-        solution = await generate_structured(
-            message,
-            response_model=CaptchaSolution,
-            model=base_config.get("auxiliary_llm_model"),
-            instruction=CAPTCHA_SYSTEM_PROMPT,
+        logger.debug(
+            f"   - 已截取验证码区域图片 ({len(raw_screenshot)} -> {len(screenshot_bytes)} bytes)"
         )
 
-        if not solution or not solution.success or not solution.indices:
-            logger.warning("   - LLM未能解析验证码或未返回有效序号。")
-            return False
-
-        logger.debug(f"   - LLM识别结果：需要拖动图片序号 {solution.indices}")
+        puzzle_key = hashlib.blake2b(
+            captcha_prompt.encode() + raw_screenshot, digest_size=16
+        ).hexdigest()
+        if cached_candidates := candidate_cache.get(puzzle_key):
+            indices = cached_candidates.pop(0)
+            logger.debug(f"   - 题目未变化，直接尝试LLM给出的备选序号 {indices}")
+        else:
+            message = [
+                LLMMessage.user([
+                    TextPart(text=f"问题是：'{captcha_prompt}'"),
+                    ImagePart(raw=screenshot_bytes)
+                ])
+            ]
+            logger.debug("   - 正在调用Vision LLM分析验证码...")
+            solution = await generate_structured(
+                message,
+                response_model=CaptchaSolution,
+                model=base_config.get("auxiliary_llm_model"),
+                instruction=CAPTCHA_SYSTEM_PROMPT,
+            )
+
+            if not solution or not solution.success or not solution.indices:
+                logger.warning("   - LLM未能解析验证码或未返回有效序号。")
+                return False
+
+            indices = solution.indices
+            candidate_cache[puzzle_key] = [
+                candidate
+                for candidate in solution.alternatives
+                if candidate and candidate != indices
+            ]
+            logger.debug(
+                f"   - LLM识别结果：需要拖动图片序号 {indices}，"
+                f"备选 {candidate_cache[puzzle_key]}"
+            )
 
         image_elements = captcha_frame.locator(
             "#captcha_verify_image > div.img-container .canvas-container"
         )
         drag_area = captcha_frame.locator("#captcha_verify_image > div.drag-area")
-        if await image_elements.count() == 0:
+        image_count = await image_elements.count()
+        if image_count == 0:
             logger.error("   - 无法在页面上定位到验证码图片元素。")
             return False
 
-        for index in solution.indices:
-            if 1 <= index <= await image_elements.count():
-                source_element = image_elements.nth(index - 1)
-                source_box = await source_element.bounding_box()
-                target_box = await drag_area.bounding_box()
-
-                if source_box and target_box:
-                    logger.debug(f"   - 正在模拟拖动第 {index} 张图片...")
-                    
-                    start_x = source_box["x"] + source_box["width"] / 2
-                    start_y = source_box["y"] + source_box["height"] / 2
-                    end_x = target_box["x"] + target_box["width"] / 2
-                    end_y = target_box["y"] + target_box["height"] / 2
-
-                    await page.mouse.move(
-                        start_x + random.uniform(-5, 5),
-                        start_y + random.uniform(-5, 5),
-                        steps=random.randint(10, 20)
-                    )
-                    await page.mouse.down()
-                    await asyncio.sleep(random.uniform(0.1, 0.3))
-                    
-                    await page.mouse.move(
-                        end_x + random.uniform(-10, 10),
-                        end_y + random.uniform(-10, 10),
-                        steps=random.randint(30, 60),
-                    )
-                    await page.mouse.up()
-                    await asyncio.sleep(random.uniform(0.5, 1.0))
-                else:
-                    logger.warning(
-                        f"   - 无法获取第 {index} 张图片或拖动区域的边界框，跳过。"
-                    )
+        requested_indices = set(indices)
+        valid_indices = sorted(requested_indices & set(range(1, image_count + 1)))
+        if invalid_indices := requested_indices.difference(valid_indices):
+            logger.warning(f"   - LLM返回了无效的图片序号: {sorted(invalid_indices)}，已跳过。")
+
+        *source_boxes, target_box = await asyncio.gather(
+            *(image_elements.nth(index - 1).bounding_box() for index in valid_indices),
+            drag_area.bounding_box(),
+        )
+
+        for index, source_box in zip(valid_indices, source_boxes):
+            if source_box and target_box:
+                logger.debug(f"   - 正在模拟拖动第 {index} 张图片...")
+
+                start_x = source_box["x"] + source_box["width"] / 2
+                start_y = source_box["y"] + source_box["height"] / 2
+                end_x = target_box["x"] + target_box["width"] / 2
+                end_y = target_box["y"] + target_box["height"] / 2
+
+                grab_x = start_x + random.uniform(-5, 5)
+                grab_y = start_y + random.uniform(-5, 5)
+                await page.mouse.move(grab_x, grab_y, steps=random.randint(10, 20))
+                await page.mouse.down()
+                await asyncio.sleep(random.uniform(0.1, 0.3))
+
+                for path_x, path_y in HumanActionUtils.bezier_path(
+                    grab_x,
+                    grab_y,
+                    end_x + random.uniform(-10, 10),
+                    end_y + random.uniform(-10, 10),
+                    points=random.randint(30, 60),
+                ):
+                    await page.mouse.move(path_x, path_y)
+                await page.mouse.up()
+                await asyncio.sleep(random.uniform(0.5, 1.0))
             else:
-                logger.warning(f"   - LLM返回了无效的图片序号: {index}，已跳过。")
+                logger.warning(
+                    f"   - 无法获取第 {index} 张图片或拖动区域的边界框，跳过。"
+                )
 
         submit_button = captcha_frame.locator(".vc-captcha-verify-pc-button")
         await submit_button.click()
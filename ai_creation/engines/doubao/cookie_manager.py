@@ -1,9 +1,14 @@
+import asyncio
+from collections.abc import Collection
+from dataclasses import dataclass
 from datetime import date, datetime
-import json
+import hashlib
+import heapq
+import os
 from pathlib import Path
-from typing import Any
-
-import aiofiles
+import sys
+import time
+import orjson
 
 from zhenxun.configs.path_config import DATA_PATH
 from zhenxun.services.log import logger
@@ -11,37 +16,140 @@ from zhenxun.services.log import logger
 from ...config import base_config
 
 COOKIE_DAILY_LIMIT = 100
+STATE_FLUSH_DELAY = 0.5
+DATE_CHECK_INTERVAL = 60
 
 PLUGIN_NAME = Path(__file__).resolve().parents[2].name
 STATE_FILE = DATA_PATH / PLUGIN_NAME / "cookie_state.json"
+STATE_TEMP_FILE = STATE_FILE.with_suffix(".json.tmp")
+
+
+def _cookie_fingerprint(cookie: str) -> str:
+    """Cookie 的短指纹，状态文件中以此代替完整的 Cookie 字符串"""
+    return hashlib.blake2b(cookie.encode(), digest_size=16).hexdigest()
+
+
+def _write_state_file(data: bytes):
+    """写入临时文件后原子替换状态文件（同步，供线程池调用，一次线程切换完成全部系统调用）"""
+    with open(STATE_TEMP_FILE, "wb") as f:
+        f.write(data)
+    os.replace(STATE_TEMP_FILE, STATE_FILE)
+
+
+@dataclass(slots=True)
+class CookieState:
+    """单个Cookie的使用状态"""
+
+    cookie: str
+    cookie_id: str
+    usage: int = 0
+    valid: bool = True
 
 
 class DoubaoCookieManager:
     def __init__(self):
-        self._cookie_states: list[dict[str, Any]] = []
+        self._cookie_states: dict[str, CookieState] = {}
+        self._usage_heap: list[tuple[int, str]] = []
+        self._available_count = 0
         self._last_reset_date: date | None = None
+        self._today: date | None = None
+        self._today_checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._dirty = False
+        self._last_saved_hash: int | None = None
+        self._flush_task: asyncio.Task | None = None
         STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     async def _save_states(self):
-        """将当前Cookie状态持久化到文件。"""
+        """将当前Cookie状态持久化到文件，写入成功后才清除待写入标记。调用方需持有锁。"""
         try:
             reset_date_to_save = self._last_reset_date or date.today()
+            state_hash = hash(
+                (
+                    reset_date_to_save,
+                    tuple(
+                        (cookie, state.usage, state.valid)
+                        for cookie, state in self._cookie_states.items()
+                    ),
+                )
+            )
+            if state_hash == self._last_saved_hash:
+                self._dirty = False
+                return
+
             data_to_save = {
                 "last_reset_date": reset_date_to_save.isoformat(),
-                "cookies": self._cookie_states,
+                "cookies": [
+                    {
+                        "cookie_id": state.cookie_id,
+                        "usage": state.usage,
+                        "valid": state.valid,
+                    }
+                    for state in self._cookie_states.values()
+                ],
             }
-            async with aiofiles.open(STATE_FILE, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(data_to_save, indent=4, ensure_ascii=False))
+            await asyncio.to_thread(
+                _write_state_file,
+                orjson.dumps(data_to_save, option=orjson.OPT_INDENT_2),
+            )
+            self._last_saved_hash = state_hash
+            self._dirty = False
         except Exception as e:
+            self._dirty = True
             logger.error(f"保存Cookie状态文件失败: {e}")
 
+    def _rebuild_usage_heap(self):
+        """按当前用量重建最小堆索引。调用方需持有锁。"""
+        self._usage_heap = [
+            (state.usage, cookie) for cookie, state in self._cookie_states.items()
+        ]
+        heapq.heapify(self._usage_heap)
+
+    def _recount_available(self):
+        """重新统计可用Cookie数量。调用方需持有锁。"""
+        self._available_count = sum(
+            1
+            for state in self._cookie_states.values()
+            if state.usage < COOKIE_DAILY_LIMIT and state.valid
+        )
+
+    def _is_current_entry(self, usage: int, cookie: str) -> bool:
+        """堆中条目是否仍与Cookie的最新状态一致（采用惰性删除）"""
+        state = self._cookie_states.get(cookie)
+        return state is not None and state.usage == usage and state.valid
+
+    def _mark_dirty(self):
+        """标记状态已变更，并在短暂延迟后合并写入一次。调用方需持有锁。"""
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(STATE_FLUSH_DELAY)
+        await self.flush()
+
+    async def flush(self):
+        """立即写入尚未持久化的使用次数变更（先等待已排期的延迟写入结束，避免并发写文件）。"""
+        flush_task = self._flush_task
+        if flush_task is not None and flush_task is not asyncio.current_task():
+            await asyncio.gather(flush_task, return_exceptions=True)
+        async with self._lock:
+            if self._dirty:
+                await self._save_states()
+
     async def _check_and_reset_daily_usage(self):
-        """检查是否为新的一天，如果是，则重置所有cookie的使用次数。"""
-        today = date.today()
+        """检查是否为新的一天，如果是，则重置所有cookie的使用次数。调用方需持有锁。"""
+        now = time.monotonic()
+        if self._today is None or now - self._today_checked_at >= DATE_CHECK_INTERVAL:
+            self._today = date.today()
+            self._today_checked_at = now
+        today = self._today
         if not self._last_reset_date or today > self._last_reset_date:
             logger.debug(f"新的一天 ({today.isoformat()})，重置所有Cookie使用额度。")
-            for state in self._cookie_states:
-                state["usage"] = 0
+            for state in self._cookie_states.values():
+                state.usage = 0
+            self._rebuild_usage_heap()
+            self._recount_available()
             self._last_reset_date = today
             await self._save_states()
 
@@ -49,114 +157,164 @@ class DoubaoCookieManager:
         """从配置和状态文件加载并同步Cookie，处理每日重置。"""
         logger.debug("正在加载并同步Cookie状态...")
 
-        config_cookies_raw = base_config.get("DOUBAO_COOKIES", [])
-        if isinstance(config_cookies_raw, str):
-            config_cookies = {config_cookies_raw}
-        elif isinstance(config_cookies_raw, list):
-            config_cookies = {
-                cookie for cookie in config_cookies_raw if isinstance(cookie, str)
-            }
-        else:
-            config_cookies = set()
-
-        old_states: dict[str, dict] = {}
-        last_reset_date_str = ""
-        if STATE_FILE.exists():
-            try:
-                async with aiofiles.open(STATE_FILE, "r", encoding="utf-8") as f:
-                    content = await f.read()
+        async with self._lock:
+            config_cookies_raw = base_config.get("DOUBAO_COOKIES", [])
+            if isinstance(config_cookies_raw, str):
+                config_cookies = {sys.intern(config_cookies_raw)}
+            elif isinstance(config_cookies_raw, list):
+                config_cookies = {
+                    sys.intern(cookie)
+                    for cookie in config_cookies_raw
+                    if isinstance(cookie, str)
+                }
+            else:
+                config_cookies = set()
+
+            old_states: dict[str, dict] = {}
+            last_reset_date_str = ""
+            if STATE_FILE.exists():
+                try:
+                    content = await asyncio.to_thread(STATE_FILE.read_bytes)
                     if content:
-                        saved_data = json.loads(content)
+                        saved_data = orjson.loads(content)
                         last_reset_date_str = saved_data.get("last_reset_date", "")
                         for state in saved_data.get("cookies", []):
-                            cookie_val = state.get("cookie")
+                            cookie_id = state.get("cookie_id")
+                            if not isinstance(cookie_id, str):
+                                legacy_cookie = state.get("cookie")
+                                if not isinstance(legacy_cookie, str):
+                                    continue
+                                cookie_id = _cookie_fingerprint(legacy_cookie)
                             usage_val = state.get("usage", 0)
                             valid_val = state.get("valid", True)
-                            if isinstance(cookie_val, str):
-                                old_states[cookie_val] = {"usage": int(usage_val), "valid": valid_val}
-            except Exception as e:
-                logger.error(f"读取Cookie状态文件失败: {e}")
-
-        if last_reset_date_str:
-            try:
-                self._last_reset_date = datetime.fromisoformat(
-                    last_reset_date_str
-                ).date()
-            except ValueError:
-                logger.warning(f"无法解析状态文件中的日期: {last_reset_date_str}")
-                self._last_reset_date = None
-
-        synced_states: list[dict[str, Any]] = []
-        for cookie in config_cookies:
-            old_state = old_states.get(cookie, {"usage": 0, "valid": True})
-            synced_states.append(
-                {"cookie": cookie, "usage": old_state["usage"], "valid": old_state["valid"]}
+                            old_states[cookie_id] = {"usage": int(usage_val), "valid": valid_val}
+                except Exception as e:
+                    logger.error(f"读取Cookie状态文件失败: {e}")
+
+            if last_reset_date_str:
+                try:
+                    self._last_reset_date = datetime.fromisoformat(
+                        last_reset_date_str
+                    ).date()
+                except ValueError:
+                    logger.warning(f"无法解析状态文件中的日期: {last_reset_date_str}")
+                    self._last_reset_date = None
+
+            today = date.today()
+            needs_reset = not self._last_reset_date or today > self._last_reset_date
+            if needs_reset:
+                logger.debug(f"新的一天 ({today.isoformat()})，重置所有Cookie使用额度。")
+                self._last_reset_date = today
+
+            synced_states: dict[str, CookieState] = {}
+            for cookie in config_cookies:
+                cookie_id = _cookie_fingerprint(cookie)
+                old_state = old_states.get(cookie_id, {"usage": 0, "valid": True})
+                synced_states[cookie] = CookieState(
+                    cookie=cookie,
+                    cookie_id=cookie_id,
+                    usage=0 if needs_reset else old_state["usage"],
+                    valid=old_state["valid"],
+                )
+
+            self._cookie_states = synced_states
+            self._rebuild_usage_heap()
+            self._recount_available()
+            logger.debug(
+                f"✅ Cookie状态同步完成，加载了 {len(self._cookie_states)} 个有效Cookie。"
             )
+            await self._save_states()
 
-        self._cookie_states = synced_states
-        logger.debug(
-            f"✅ Cookie状态同步完成，加载了 {len(self._cookie_states)} 个有效Cookie。"
-        )
-        await self._save_states()
-        await self._check_and_reset_daily_usage()
-
-    async def get_next_cookie(self) -> str | None:
-        """获取下一个使用次数最少且可用的cookie。"""
-        await self._check_and_reset_daily_usage()
-
-        available_cookies = [
-            state
-            for state in self._cookie_states
-            if state["usage"] < COOKIE_DAILY_LIMIT
-            and state.get("valid", True)
-        ]
+    async def get_next_cookie(self, exclude: Collection[str] = ()) -> str | None:
+        """
+        获取下一个使用次数最少且可用的cookie。
+        优先避开 exclude 中正在被其他浏览器使用的cookie，全部被占用时再退回共享。
+        """
+        async with self._lock:
+            await self._check_and_reset_daily_usage()
 
-        if not available_cookies:
-            logger.warning("🍪 所有可用Cookie今日额度已用尽。")
-            return None
+            excluded_entries: list[tuple[int, str]] = []
+            best_entry: tuple[int, str] | None = None
+            while self._usage_heap:
+                entry = heapq.heappop(self._usage_heap)
+                if not self._is_current_entry(*entry):
+                    continue
+                if entry[0] >= COOKIE_DAILY_LIMIT:
+                    heapq.heappush(self._usage_heap, entry)
+                    break
+                if entry[1] in exclude:
+                    excluded_entries.append(entry)
+                    continue
+                best_entry = entry
+                heapq.heappush(self._usage_heap, entry)
+                break
 
-        available_cookies.sort(key=lambda state: state["usage"])
-        best_cookie_state = available_cookies[0]
+            if best_entry is None and excluded_entries:
+                best_entry = excluded_entries[0]
+            for entry in excluded_entries:
+                heapq.heappush(self._usage_heap, entry)
 
-        cookie_str = best_cookie_state["cookie"]
-        usage = best_cookie_state["usage"]
-        logger.debug(
-            f"🍪 选中Cookie: ...{cookie_str[-20:]} (当前用量: {usage}/{COOKIE_DAILY_LIMIT})"
-        )
-        return cookie_str
+            if best_entry is None:
+                logger.warning("🍪 所有可用Cookie今日额度已用尽。")
+                return None
+
+            best_cookie_state = self._cookie_states[best_entry[1]]
+
+            cookie_str = best_cookie_state.cookie
+            usage = best_cookie_state.usage
+            logger.debug(
+                f"🍪 选中Cookie: ...{cookie_str[-20:]} (当前用量: {usage}/{COOKIE_DAILY_LIMIT})"
+            )
+            return cookie_str
+
+    def peek_next_cookie(self, exclude: Collection[str] = ()) -> str | None:
+        """预览 get_next_cookie 下一次将选中的cookie，不修改任何状态也不输出日志。"""
+        fallback: str | None = None
+        for usage, cookie in sorted(self._usage_heap):
+            if usage >= COOKIE_DAILY_LIMIT:
+                break
+            if not self._is_current_entry(usage, cookie):
+                continue
+            if cookie not in exclude:
+                return cookie
+            if fallback is None:
+                fallback = cookie
+        return fallback
 
     async def increment_usage(self, cookie: str):
         """为一个Cookie的使用次数+1并保存状态。"""
-        for state in self._cookie_states:
-            if state["cookie"] == cookie:
-                state["usage"] += 1
-                logger.debug(
-                    f"✅ Cookie ...{cookie[-20:]} 使用次数+1，当前为: {state['usage']}"
-                )
-                await self._save_states()
-                break
+        cookie = sys.intern(cookie)
+        async with self._lock:
+            state = self._cookie_states.get(cookie)
+            if state is None:
+                return
+
+            state.usage += 1
+            if state.usage == COOKIE_DAILY_LIMIT and state.valid:
+                self._available_count -= 1
+            heapq.heappush(self._usage_heap, (state.usage, cookie))
+            logger.debug(
+                f"✅ Cookie ...{cookie[-20:]} 使用次数+1，当前为: {state.usage}"
+            )
+            self._mark_dirty()
 
     async def mark_cookie_invalid(self, cookie: str):
         """标记一个Cookie为失效。"""
-        for state in self._cookie_states:
-            if state["cookie"] == cookie:
-                state["valid"] = False
-                logger.warning(
-                    f"🚫 Cookie ...{cookie[-20:]} 已被标记为失效，将不再使用。"
-                )
-                await self._save_states()
-                break
+        cookie = sys.intern(cookie)
+        async with self._lock:
+            state = self._cookie_states.get(cookie)
+            if state is None or not state.valid:
+                return
+
+            state.valid = False
+            if state.usage < COOKIE_DAILY_LIMIT:
+                self._available_count -= 1
+            logger.warning(f"🚫 Cookie ...{cookie[-20:]} 已被标记为失效，将不再使用。")
+            await self._save_states()
 
     def get_available_cookie_count(self) -> int:
         """获取当前可用cookie数量。"""
-        return len(
-            [
-                state
-                for state in self._cookie_states
-                if state["usage"] < COOKIE_DAILY_LIMIT
-                and state.get("valid", True)
-            ]
-        )
+        return self._available_count
 
     def get_total_cookie_count(self) -> int:
         """获取配置的Cookie总数。"""
@@ -1,16 +1,21 @@
 import asyncio
-import base64
 from datetime import datetime
-import hashlib
-import json
+import functools
+import math
+import os
+from pathlib import Path
 import re
 import random
-from typing import Any, cast
+import time
+from typing import Any, ClassVar
 
+import orjson
 from playwright.async_api import (
     Browser,
     BrowserContext,
+    CDPSession,
     Page,
+    Playwright,
     TimeoutError as PlaywrightTimeoutError,
     ViewportSize,
     async_playwright,
@@ -22,25 +27,135 @@ from zhenxun.services.log import logger
 from ...config import DOUBAO_SELECTORS, base_config
 from ...utils.downloader import IMAGE_DIR, ImageDownloader
 from .exceptions import ImageGenerationError, CookieInvalidError
+from .sse_stream import SSEStreamParser, SSEStreamTap
 
-REALISTIC_USER_AGENTS = [
+REALISTIC_USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36 Edg/123.0.0.0",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
-]
+)
+
+COMMON_VIEWPORTS = (
+    ViewportSize(width=1920, height=1080),
+    ViewportSize(width=1366, height=768),
+    ViewportSize(width=1440, height=900),
+    ViewportSize(width=1536, height=864),
+    ViewportSize(width=1280, height=720),
+)
+
+HARDWARE_CONCURRENCY_OPTS = (4, 8, 12, 16)
+DEVICE_MEMORY_OPTS = (4, 8, 16, 32)
+DEVICE_SCALE_FACTORS = (1, 1.25, 1.5)
+
+# 隐身脚本配置与指纹注入脚本模板只构造一次，每个上下文仅代入随机参数
+STEALTH = Stealth()
+FINGERPRINT_INIT_SCRIPT = """
+Object.defineProperty(navigator, 'hardwareConcurrency', {{ get: () => {hw_concurrency} }});
+Object.defineProperty(navigator, 'deviceMemory', {{ get: () => {device_memory} }});
+// 简单的 WebGL 干扰（微小的指纹噪声）
+const getParameter = WebGLRenderingContext.prototype.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {{
+    // 37446 是 RENDERER
+    if (parameter === 37446) {{
+        const result = getParameter.apply(this, [parameter]);
+        return result + ' (Custom Build)';
+    }}
+    return getParameter.apply(this, [parameter]);
+}};
+"""
+
+# 候选选择器在模块加载时一次性展开；输入框候选附加 :visible，
+# 拼接后的联合选择器可一次等待所有候选，而不必逐个串行超时
+FILE_UPLOAD_SELECTOR = ", ".join(DOUBAO_SELECTORS["file_upload"])
+PROMPT_INPUT_SELECTORS = tuple(
+    f"{selector}:visible" for selector in DOUBAO_SELECTORS["prompt_input"]
+)
+PROMPT_INPUT_SELECTOR = ", ".join(PROMPT_INPUT_SELECTORS)
+
+# 共享浏览器在最后一个使用者归还后保留的时间（秒），以及重启前允许创建的上下文数量
+SHARED_BROWSER_LINGER_SECONDS = 30
+SHARED_BROWSER_MAX_USES = 50
+
+# 预热页面的有效期（秒），超过后重新导航以免页面状态过旧
+WARM_PAGE_MAX_AGE = 300
+
+# 上传的图片预览数量已达预期且缩略图上没有上传中标记（加载圈、进度条）时视为上传完成
+UPLOAD_READY_SCRIPT = """(count) => document.querySelectorAll(
+    'img[src^="blob:"], [class*="upload-preview"]'
+).length >= count && !document.querySelector(
+    '[class*="upload"] [class*="loading"], [class*="upload"] [class*="spin"], '
+    + '[class*="upload"] [class*="progress"]'
+)"""
 
-COMMON_VIEWPORTS = [
-    {"width": 1920, "height": 1080},
-    {"width": 1366, "height": 768},
-    {"width": 1440, "height": 900},
-    {"width": 1536, "height": 864},
-    {"width": 1280, "height": 720},
-]
+# 等待上传完成的最长时间（秒），与原先的固定等待一致；检测到上传完成时提前结束
+UPLOAD_READY_TIMEOUT = 7.0
 
-HARDWARE_CONCURRENCY_OPTS = [4, 8, 12, 16]
-DEVICE_MEMORY_OPTS = [4, 8, 16, 32]
+# 只有脚本发起的请求才可能携带接口数据或SSE流，图片、样式、脚本等静态资源直接跳过
+API_RESOURCE_TYPES = frozenset({"xhr", "fetch", "eventsource"})
+
+IMAGE_ID_PATTERN = re.compile(r"rc_gen_image/([^/~\.]+)")
+
+# 直接在原始字节上匹配图片链接，免去整段响应的 UTF-8 解码
+IMAGE_URL_PATTERN = re.compile(
+    rb'(https?://[a-zA-Z0-9\-\.]+\.byteimg\.com[^\s"\'\\]+rc_gen_image/[^\s"\'\\]+)'
+)
+
+# Cookie 字符串一次扫描切分为 (name, value) 对
+COOKIE_PAIR_PATTERN = re.compile(r"\s*([^=;\s]+)\s*=\s*([^;]*)")
+
+# SSE 行的字节级预筛选：不含这些片段的行无需解码或JSON解析
+SSE_IMAGE_MARKER = b"rc_gen_image"
+SSE_TEXT_EVENT_MARKER = b"2001"
+SSE_END_EVENT_MARKER = b"2003"
+# 生成请求的SSE事件都带有 event_type 字段，据此在页面的多条事件流中识别出生成流
+SSE_EVENT_TYPE_MARKER = b'"event_type"'
+
+
+def _build_cp1252_translation() -> dict[int, int]:
+    """cp1252 独有字符 -> 其单字节值对应的码位，使其能与 latin-1 字符一起整体编码"""
+    translation: dict[int, int] = {}
+    for byte in range(0x80, 0xA0):
+        try:
+            char = bytes([byte]).decode("cp1252")
+        except UnicodeDecodeError:
+            continue
+        translation[ord(char)] = byte
+    return translation
+
+
+# 乱码修复：先把 cp1252 独有字符折算为单字节码位，再按可编码为单字节的连续片段整体还原
+CP1252_TRANSLATION = _build_cp1252_translation()
+SINGLE_BYTE_RUN_PATTERN = re.compile(r"[\x00-\xff]+")
+# UTF-8 多字节序列的首字节按 latin-1 解读后落在此范围，文本中没有这类字符时不可能是乱码
+MOJIBAKE_LEAD_PATTERN = re.compile(r"[\xc2-\xf4]")
+
+
+def _decode_single_byte_run(text: str) -> str:
+    """将一段可逐字符编码为单字节的文本按 UTF-8 重新解码"""
+    raw = text.encode("latin-1")
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("utf-8", errors="ignore")
+
+
+@functools.lru_cache(maxsize=1024)
+def _repair_mojibake_text(text: str) -> str:
+    """将可能出现乱码的文本尝试还原为 UTF-8 正常文本。"""
+    if not text:
+        return ""
+    if text.isascii() or not MOJIBAKE_LEAD_PATTERN.search(text):
+        return text
+
+    text = text.translate(CP1252_TRANSLATION)
+    try:
+        return _decode_single_byte_run(text)
+    except UnicodeEncodeError:
+        return SINGLE_BYTE_RUN_PATTERN.sub(
+            lambda match: _decode_single_byte_run(match.group()), text
+        )
 
 
 class HumanActionUtils:
@@ -56,8 +171,14 @@ class HumanActionUtils:
         await asyncio.sleep(sleep_time)
 
     @classmethod
-    async def human_move_to(cls, page: Page, element, steps: int = 25):
-        """模拟人类鼠标移动轨迹（分段逼近 + 变速）"""
+    async def human_move_to(
+        cls,
+        page: Page,
+        element,
+        steps: int = 25,
+        cdp_session: CDPSession | None = None,
+    ):
+        """模拟人类鼠标移动轨迹（贝塞尔曲线逼近 + 变速）"""
         box = await element.bounding_box()
         if not box:
             return
@@ -70,10 +191,82 @@ class HumanActionUtils:
         mid_x = target_x + offset_x
         mid_y = target_y + offset_y
 
+        # 第一段由 Playwright 从其记录的当前位置出发，光标不会跳变
         await page.mouse.move(mid_x, mid_y, steps=max(2, int(steps * 0.6)))
 
+        if cdp_session is not None and await cls._dispatch_mouse_path(
+            cdp_session,
+            cls.bezier_path(mid_x, mid_y, target_x, target_y, points=steps),
+        ):
+            # 同步 Playwright 记录的鼠标位置，后续 mouse.down/up 会在此处触发
+            await page.mouse.move(target_x, target_y)
+            return
+
         await page.mouse.move(target_x, target_y, steps=steps)
 
+    @staticmethod
+    async def _dispatch_mouse_path(
+        session: CDPSession, path: list[tuple[float, float]]
+    ) -> bool:
+        """通过已建立的 CDP 会话一次性流水线发送整段轨迹的鼠标移动事件，失败时返回 False"""
+        try:
+            await asyncio.gather(
+                *(
+                    session.send(
+                        "Input.dispatchMouseEvent",
+                        {"type": "mouseMoved", "x": x, "y": y, "button": "none"},
+                    )
+                    for x, y in path
+                )
+            )
+            return True
+        except Exception as e:
+            logger.debug(f"CDP鼠标轨迹发送失败，退回逐步移动: {e}")
+            return False
+
+    @staticmethod
+    def bezier_path(
+        start_x: float, start_y: float, end_x: float, end_y: float, points: int = 40
+    ) -> list[tuple[float, float]]:
+        """生成带随机弯曲、缓入缓出与轻微抖动的三次贝塞尔鼠标轨迹（不含起点）"""
+        dx, dy = end_x - start_x, end_y - start_y
+        distance = math.hypot(dx, dy) or 1.0
+        normal_x, normal_y = -dy / distance, dx / distance
+
+        bend_1 = random.uniform(-0.3, 0.3) * distance
+        bend_2 = random.uniform(-0.3, 0.3) * distance
+        ctrl_1 = (
+            start_x + dx * random.uniform(0.2, 0.4) + normal_x * bend_1,
+            start_y + dy * random.uniform(0.2, 0.4) + normal_y * bend_1,
+        )
+        ctrl_2 = (
+            start_x + dx * random.uniform(0.6, 0.8) + normal_x * bend_2,
+            start_y + dy * random.uniform(0.6, 0.8) + normal_y * bend_2,
+        )
+
+        jitter = random.uniform(0.5, 1.5)
+        phase = random.uniform(0, math.tau)
+        path: list[tuple[float, float]] = []
+        for i in range(1, points + 1):
+            t = i / points
+            t = t * t * (3 - 2 * t)
+            u = 1 - t
+            x = (
+                u**3 * start_x
+                + 3 * u * u * t * ctrl_1[0]
+                + 3 * u * t * t * ctrl_2[0]
+                + t**3 * end_x
+            )
+            y = (
+                u**3 * start_y
+                + 3 * u * u * t * ctrl_1[1]
+                + 3 * u * t * t * ctrl_2[1]
+                + t**3 * end_y
+            )
+            noise = jitter * math.sin(phase + t * math.pi * 4) * (1 - t)
+            path.append((x + normal_x * noise, y + normal_y * noise))
+        return path
+
     @classmethod
     async def random_mouse_wander(cls, page: Page, count: int = 2):
         """鼠标随机游走（模拟无意识晃动）"""
@@ -107,12 +300,22 @@ class HumanActionUtils:
 class DoubaoImageGenerator:
     """豆包AI图片生成器（基于Chromium浏览器自动化）"""
 
+    _shared_playwright: ClassVar[Playwright | None] = None
+    _shared_browser: ClassVar[Browser | None] = None
+    _shared_browser_users: ClassVar[int] = 0
+    _shared_browser_uses: ClassVar[int] = 0
+    _shared_browser_lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+    _shared_browser_close_task: ClassVar[asyncio.Task | None] = None
+
     def __init__(self):
         self.browser: Browser | None = None
         self.context: BrowserContext | None = None
         self.page: Page | None = None
-        self.playwright = None
         self.downloader = ImageDownloader()
+        self._session_cookie: str | None = None
+        self._cdp_session: CDPSession | None = None
+        self._warm_page_task: asyncio.Task[bool] | None = None
+        self._warm_page_at: float | None = None
 
         self.base_url = "https://www.doubao.com"
         self.create_image_url = "https://www.doubao.com/chat/create-image"
@@ -124,31 +327,100 @@ class DoubaoImageGenerator:
             f"已配置Cookies数量: {cookies_count}"
         )
 
+    @classmethod
+    async def _acquire_shared_browser(cls) -> Browser:
+        """获取所有生成器共享的Chromium浏览器，未启动或已断开时重新启动"""
+        async with cls._shared_browser_lock:
+            cls._cancel_shared_browser_close()
+            if cls._shared_browser is None or not cls._shared_browser.is_connected():
+                await cls._close_shared_browser()
+                try:
+                    cls._shared_playwright = await async_playwright().start()
+                    cls._shared_browser = await cls._shared_playwright.chromium.launch(
+                        headless=base_config.get("HEADLESS_BROWSER"),
+                        args=[
+                            "--no-sandbox",
+                            "--disable-blink-features=AutomationControlled",
+                            "--disable-web-security",
+                            "--disable-features=VizDisplayCompositor",
+                            "--disable-dev-shm-usage",
+                            "--no-first-run",
+                            "--disable-default-apps",
+                            "--disable-extensions",
+                            "--disable-background-timer-throttling",
+                            "--disable-backgrounding-occluded-windows",
+                            "--disable-renderer-backgrounding",
+                        ],
+                    )
+                except Exception:
+                    await cls._close_shared_browser()
+                    raise
+                logger.debug("共享Chromium浏览器已启动")
+            cls._shared_browser_users += 1
+            cls._shared_browser_uses += 1
+            return cls._shared_browser
+
+    @classmethod
+    async def _release_shared_browser(cls):
+        """
+        归还共享浏览器。最后一个使用者归还后浏览器进程会保留一段时间，
+        以便紧随其后的重新初始化（如切换Cookie、出错自愈）直接复用；
+        累计使用次数达到上限时则立即关闭，下次使用时重新启动一个干净的进程。
+        """
+        async with cls._shared_browser_lock:
+            cls._shared_browser_users = max(0, cls._shared_browser_users - 1)
+            if cls._shared_browser_users > 0:
+                return
+            if cls._shared_browser_uses >= SHARED_BROWSER_MAX_USES:
+                logger.debug("共享浏览器使用次数已达上限，关闭后将重新启动。")
+                await cls._close_shared_browser()
+            else:
+                cls._cancel_shared_browser_close()
+                cls._shared_browser_close_task = asyncio.create_task(
+                    cls._close_shared_browser_later()
+                )
+
+    @classmethod
+    def _cancel_shared_browser_close(cls):
+        task, cls._shared_browser_close_task = cls._shared_browser_close_task, None
+        if task and not task.done():
+            task.cancel()
+
+    @classmethod
+    async def _close_shared_browser_later(cls):
+        await asyncio.sleep(SHARED_BROWSER_LINGER_SECONDS)
+        async with cls._shared_browser_lock:
+            cls._shared_browser_close_task = None
+            if cls._shared_browser_users == 0:
+                await cls._close_shared_browser()
+
+    @classmethod
+    async def shutdown_shared_browser(cls):
+        """立即关闭共享浏览器（插件关闭时调用）"""
+        async with cls._shared_browser_lock:
+            cls._cancel_shared_browser_close()
+            await cls._close_shared_browser()
+
+    @classmethod
+    async def _close_shared_browser(cls):
+        """关闭共享浏览器与Playwright驱动。调用方需持有锁。"""
+        browser, cls._shared_browser = cls._shared_browser, None
+        playwright, cls._shared_playwright = cls._shared_playwright, None
+        cls._shared_browser_uses = 0
+        try:
+            if browser:
+                await browser.close()
+            if playwright:
+                await playwright.stop()
+            if browser or playwright:
+                logger.debug("共享Chromium浏览器已关闭")
+        except Exception as e:
+            logger.debug(f"关闭共享浏览器时出现非关键错误: {e}")
+
     async def initialize(self) -> bool:
         """初始化浏览器，并为本次会话使用指定的cookie"""
         try:
-            self.playwright = await async_playwright().start()
-
-            self.browser = await self.playwright.chromium.launch(
-                headless=base_config.get("HEADLESS_BROWSER"),
-                args=[
-                    "--no-sandbox",
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-web-security",
-                    "--disable-features=VizDisplayCompositor",
-                    "--disable-dev-shm-usage",
-                    "--no-first-run",
-                    "--disable-default-apps",
-                    "--disable-extensions",
-                    "--disable-background-timer-throttling",
-                    "--disable-backgrounding-occluded-windows",
-                    "--disable-renderer-backgrounding",
-                ],
-            )
-
-            if self.browser is None:
-                logger.error("浏览器未初始化")
-                return False
+            self.browser = await self._acquire_shared_browser()
 
             selected_ua = random.choice(REALISTIC_USER_AGENTS)
             selected_viewport = random.choice(COMMON_VIEWPORTS)
@@ -161,34 +433,26 @@ class DoubaoImageGenerator:
             )
 
             self.context = await self.browser.new_context(
-                viewport=cast(ViewportSize, selected_viewport),
+                viewport=selected_viewport,
                 user_agent=selected_ua,
                 locale="zh-CN",
                 timezone_id="Asia/Shanghai",
-                device_scale_factor=random.choice([1, 1.25, 1.5]),
+                device_scale_factor=random.choice(DEVICE_SCALE_FACTORS),
             )
 
             if self.context is None:
                 logger.error("浏览器上下文未初始化")
                 return False
 
-            await Stealth().apply_stealth_async(self.context)
-
-            await self.context.add_init_script(f"""
-                Object.defineProperty(navigator, 'hardwareConcurrency', {{ get: () => {hw_concurrency} }});
-                Object.defineProperty(navigator, 'deviceMemory', {{ get: () => {device_memory} }});
-                // 简单的 WebGL 干扰（微小的指纹噪声）
-                const getParameter = WebGLRenderingContext.prototype.getParameter;
-                WebGLRenderingContext.prototype.getParameter = function(parameter) {{
-                    // 37446 是 RENDERER
-                    if (parameter === 37446) {{
-                        const result = getParameter.apply(this, [parameter]);
-                        return result + ' (Custom Build)';
-                    }}
-                    return getParameter.apply(this, [parameter]);
-                }};
-            """)
+            await STEALTH.apply_stealth_async(self.context)
+
+            await self.context.add_init_script(
+                FINGERPRINT_INIT_SCRIPT.format(
+                    hw_concurrency=hw_concurrency, device_memory=device_memory
+                )
+            )
 
+            await self._detach_cdp_session()
             self.page = await self.context.new_page()
 
             logger.debug("豆包图片生成器浏览器初始化成功")
@@ -199,41 +463,6 @@ class DoubaoImageGenerator:
             await self.cleanup()
             return False
 
-    @staticmethod
-    def _repair_mojibake_text(text: str) -> str:
-        """将可能出现乱码的文本尝试还原为 UTF-8 正常文本。"""
-        if not text:
-            return ""
-
-        byte_buffer = bytearray()
-        parts: list[str] = []
-
-        def flush_buffer() -> None:
-            if byte_buffer:
-                try:
-                    parts.append(byte_buffer.decode("utf-8"))
-                except UnicodeDecodeError:
-                    parts.append(byte_buffer.decode("utf-8", errors="ignore"))
-                byte_buffer.clear()
-
-        for ch in text:
-            encoded: bytes | None = None
-            for enc in ("latin-1", "cp1252"):
-                try:
-                    encoded = ch.encode(enc)
-                    break
-                except UnicodeEncodeError:
-                    continue
-
-            if encoded is not None:
-                byte_buffer.extend(encoded)
-            else:
-                flush_buffer()
-                parts.append(ch)
-
-        flush_buffer()
-        return "".join(parts)
-
     @property
     def is_initialized(self) -> bool:
         """检查浏览器实例是否已成功初始化且页面可用"""
@@ -241,19 +470,14 @@ class DoubaoImageGenerator:
 
     async def cleanup(self):
         """清理资源"""
+        self._discard_warm_page()
+        self._session_cookie = None
+        await self._detach_cdp_session()
         try:
             if self.page:
                 await self.page.close()
-                self.page = None
             if self.context:
                 await self.context.close()
-                self.context = None
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
 
             logger.debug("豆包图片生成器资源清理完成")
         except Exception as e:
@@ -270,29 +494,58 @@ class DoubaoImageGenerator:
                 logger.debug(f"浏览器资源已被关闭（正常情况）: {e}")
             else:
                 logger.error(f"清理资源时发生错误: {e}")
+        finally:
+            self.page = None
+            self.context = None
+            if self.browser:
+                self.browser = None
+                await self._release_shared_browser()
+
+    async def _get_cdp_session(self) -> CDPSession | None:
+        """获取当前页面的CDP会话，首次调用时建立并缓存，失败时返回 None"""
+        if self._cdp_session is None and self.page and self.context:
+            try:
+                self._cdp_session = await self.context.new_cdp_session(self.page)
+            except Exception as e:
+                logger.debug(f"无法建立CDP会话，鼠标轨迹将退回逐步移动: {e}")
+        return self._cdp_session
+
+    async def _detach_cdp_session(self):
+        """断开缓存的CDP会话"""
+        session, self._cdp_session = self._cdp_session, None
+        if session is None:
+            return
+        try:
+            await session.detach()
+        except Exception:
+            pass
 
     async def update_session_cookie(self, cookie_str: str | None):
         """动态更新当前浏览器会话的Cookie，实现轮询"""
         if not self.context:
             raise ConnectionError("浏览器上下文未初始化，无法更新Cookie。")
 
+        if cookie_str and cookie_str == self._session_cookie:
+            logger.debug("Cookie未变化，沿用当前浏览器会话。")
+            return
+
+        self._discard_warm_page()
+        self._session_cookie = None
         try:
             await self.context.clear_cookies()
             if cookie_str:
-                cookies = []
-                for cookie_pair in cookie_str.split(";"):
-                    if "=" in cookie_pair:
-                        name, value = cookie_pair.strip().split("=", 1)
-                        cookies.append(
-                            {
-                                "name": name.strip(),
-                                "value": value.strip(),
-                                "domain": ".doubao.com",
-                                "path": "/",
-                            }
-                        )
+                cookies = [
+                    {
+                        "name": name,
+                        "value": value.strip(),
+                        "domain": ".doubao.com",
+                        "path": "/",
+                    }
+                    for name, value in COOKIE_PAIR_PATTERN.findall(cookie_str)
+                ]
                 await self.context.add_cookies(cookies)
                 logger.debug(f"浏览器会话已更新 {len(cookies)} 个Cookie。")
+                self._session_cookie = cookie_str
 
         except Exception as e:
             logger.error(f"设置cookies失败: {e}")
@@ -309,7 +562,10 @@ class DoubaoImageGenerator:
                 self.create_image_url, wait_until="domcontentloaded", timeout=60000
             )
 
-            await asyncio.sleep(5)
+            try:
+                await self.page.wait_for_selector(PROMPT_INPUT_SELECTOR, timeout=10000)
+            except PlaywrightTimeoutError:
+                logger.warning("等待豆包输入框就绪超时，将继续尝试后续流程。")
 
             title = await self.page.title()
             logger.debug(f"页面标题: {title}")
@@ -323,6 +579,45 @@ class DoubaoImageGenerator:
             logger.error(f"导航到豆包图片创建页面失败: {e}")
             return False
 
+    def prewarm_page(self, next_cookie: str | None):
+        """
+        下一次生成将沿用当前会话的Cookie时，在后台提前导航到图片创建页面。
+        Cookie不同时预热的页面会在切换Cookie时被丢弃，游客模式同理，因此不做预热。
+        """
+        if not next_cookie or next_cookie != self._session_cookie:
+            return
+        if not self.is_initialized:
+            return
+        self._discard_warm_page()
+        self._warm_page_task = asyncio.create_task(self._prepare_warm_page())
+
+    async def _prepare_warm_page(self) -> bool:
+        if not await self.navigate_to_create_image():
+            return False
+        self._warm_page_at = time.monotonic()
+        return True
+
+    def _discard_warm_page(self):
+        """丢弃预热的页面状态（Cookie变更或清理资源时调用）"""
+        if self._warm_page_task and not self._warm_page_task.done():
+            self._warm_page_task.cancel()
+        self._warm_page_task = None
+        self._warm_page_at = None
+
+    async def _take_warm_page(self) -> bool:
+        """取用预热好的页面；页面未预热、预热失败或已过期时返回 False"""
+        task, self._warm_page_task = self._warm_page_task, None
+        if task is None:
+            return False
+        ready = not task.cancelled() and await task
+        warm_page_at, self._warm_page_at = self._warm_page_at, None
+        return (
+            ready
+            and warm_page_at is not None
+            and time.monotonic() - warm_page_at < WARM_PAGE_MAX_AGE
+            and self.is_initialized
+        )
+
     async def _upload_images(self, image_paths: list[str]) -> bool:
         """上传图片到豆包输入框"""
         if not self.page:
@@ -344,66 +639,57 @@ class DoubaoImageGenerator:
             return False
 
     async def _upload_file_input(self, image_paths: list[str]) -> bool:
-        """使用文件输入框上传图片"""
-        try:
-            for selector in DOUBAO_SELECTORS["file_upload"]:
-                try:
-                    if self.page is None:
-                        logger.error("页面未初始化")
-                        continue
-                    await self.page.evaluate(f"""
-                        () => {{
-                            const inputs = document.querySelectorAll('{selector}');
-                            inputs.forEach(input => {{
-                                input.style.display = 'block';
-                                input.style.visibility = 'visible';
-                                input.style.opacity = '1';
-                                input.style.position = 'static';
-                            }});
-                        }}
-                    """)
-
-                    if self.page is None:
-                        logger.error("页面未初始化")
-                        continue
-                    upload_element = await self.page.wait_for_selector(
-                        selector, timeout=1000
-                    )
-                    if upload_element:
-                        await upload_element.set_input_files(image_paths)
-                        logger.debug(
-                            f"通过文件输入框成功上传 {len(image_paths)} 张图片: {selector}"
-                        )
-                        await asyncio.sleep(2)
-                        return True
-
-                except Exception:
-                    continue
-
+        """使用文件输入框上传图片（Playwright 可直接为隐藏的 input 设置文件）"""
+        if self.page is None:
+            logger.error("页面未初始化")
             return False
 
+        try:
+            await self.page.locator(FILE_UPLOAD_SELECTOR).first.set_input_files(
+                image_paths, timeout=3000
+            )
+            logger.debug(f"通过文件输入框成功上传 {len(image_paths)} 张图片")
+            return True
+
         except Exception as e:
             logger.error(f"文件输入框上传失败: {e}")
             return False
 
+    async def _wait_for_upload_ready(self, image_count: int, upload_started_at: float):
+        """
+        等待上传图片的预览出现且上传中标记消失，检测到即提前返回。
+        从开始上传起最多等待 UPLOAD_READY_TIMEOUT 秒，未检测到时等满后继续。
+        """
+        if not self.page:
+            return
+
+        remaining = UPLOAD_READY_TIMEOUT - (time.monotonic() - upload_started_at)
+        try:
+            await self.page.wait_for_function(
+                UPLOAD_READY_SCRIPT,
+                arg=image_count,
+                timeout=max(remaining, 0.1) * 1000,
+            )
+            logger.debug("上传的图片已处理完毕。")
+        except PlaywrightTimeoutError:
+            logger.debug("未检测到上传完成标记，已等满上传等待时间，继续后续流程。")
+
     async def _input_prompt(self, prompt: str) -> bool:
         """输入提示词"""
         if not self.page:
             return False
 
         try:
+            try:
+                await self.page.wait_for_selector(PROMPT_INPUT_SELECTOR, timeout=3000)
+            except PlaywrightTimeoutError:
+                logger.warning("等待豆包输入框出现超时")
+
             input_element = None
-            for selector in DOUBAO_SELECTORS["prompt_input"]:
-                try:
-                    input_element = await self.page.wait_for_selector(
-                        selector, timeout=3000
-                    )
-                    if input_element:
-                        logger.debug(f"找到豆包输入框: {selector}")
-                        break
-                except Exception:
-                    logger.warning(f"等待元素 {selector} 超时或失败")
-                    continue
+            for selector in PROMPT_INPUT_SELECTORS:
+                if input_element := await self.page.query_selector(selector):
+                    logger.debug(f"找到豆包输入框: {selector}")
+                    break
 
             if not input_element:
                 logger.error("未找到输入框")
@@ -430,7 +716,9 @@ class DoubaoImageGenerator:
             try:
                 submit_button = self.page.locator("button#flow-end-msg-send")
 
-                await HumanActionUtils.human_move_to(self.page, submit_button)
+                await HumanActionUtils.human_move_to(
+                    self.page, submit_button, cdp_session=await self._get_cdp_session()
+                )
                 await HumanActionUtils.random_sleep(0.3, 0.7)
 
                 box = await submit_button.bounding_box()
@@ -446,17 +734,11 @@ class DoubaoImageGenerator:
                 return True
             except PlaywrightTimeoutError:
                 logger.warning("点击提交按钮超时，尝试使用回车键作为备选方法...")
-                input_element = None
-                for selector in DOUBAO_SELECTORS["prompt_input"]:
-                    if not self.page or self.page.is_closed():
-                        logger.error("备选方法失败：页面已关闭。")
-                        return False
-                    element = await self.page.query_selector(selector)
-                    if element and await element.is_visible():
-                        input_element = element
-                        logger.debug(f"找到用于回车的输入框: {selector}")
-                        break
+                if not self.page or self.page.is_closed():
+                    logger.error("备选方法失败：页面已关闭。")
+                    return False
 
+                input_element = await self.page.query_selector(PROMPT_INPUT_SELECTOR)
                 if not input_element:
                     logger.error("备选方法失败：未能找到输入框来发送回车键。")
                     return False
@@ -535,22 +817,53 @@ class DoubaoImageGenerator:
         except Exception as e:
             logger.warning(f"尝试切换模型时发生非致命异常，将继续默认流程: {e}")
 
-    async def _handle_captcha_if_present(self) -> bool:
+    async def _wait_for_captcha(
+        self, generation_started: asyncio.Event | None = None, timeout: float = 5.0
+    ) -> bool:
+        """
+        等待验证码弹窗出现。
+        生成请求一旦开始返回数据就说明没有被验证码拦截，此时无需等满超时时间。
+        """
+        if not self.page:
+            return False
+
+        captcha_task = asyncio.create_task(
+            self.page.locator("#captcha_container").wait_for(
+                state="visible", timeout=timeout * 1000
+            )
+        )
+        waiters: set[asyncio.Task] = {captcha_task}
+        if generation_started is not None:
+            waiters.add(asyncio.create_task(generation_started.wait()))
+        try:
+            done, _ = await asyncio.wait(
+                waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for task in waiters:
+                if not task.done():
+                    task.cancel()
+
+        if captcha_task not in done or captcha_task.cancelled():
+            return False
+        return captcha_task.exception() is None
+
+    async def _handle_captcha_if_present(
+        self, generation_started: asyncio.Event | None = None
+    ) -> bool:
         """
         检查页面是否存在验证码，如果存在且配置开启，则尝试解决。
         """
         if not self.page:
             return False
 
+        if not await self._wait_for_captcha(generation_started):
+            logger.debug("未检测到验证码弹窗，流程继续。")
+            return False
+
         if not base_config.get("DOUBAO_AUTO_SOLVE_CAPTCHA", True):
-            try:
-                captcha_container = self.page.locator("#captcha_container")
-                await captcha_container.wait_for(state="visible", timeout=5000)
-                logger.warning("检测到豆包验证码，但自动破解功能已关闭，任务失败。")
-                raise ImageGenerationError("遇到验证码，但自动破解功能已关闭。")
-            except PlaywrightTimeoutError:
-                logger.debug("未检测到验证码弹窗，且自动破解已关闭，流程继续。")
-                return False
+            logger.warning("检测到豆包验证码，但自动破解功能已关闭，任务失败。")
+            raise ImageGenerationError("遇到验证码，但自动破解功能已关闭。")
 
         from .captcha_solver import solve_drag_captcha_if_present
 
@@ -569,21 +882,65 @@ class DoubaoImageGenerator:
         generation_complete_event = asyncio.Event()
         sse_error_event = asyncio.Event()
         page_closed_event = asyncio.Event()
+        # 上述任一事件被设置时同时唤醒主流程，等待时只需一个事件而无需为每个事件创建任务
+        any_signal_event = asyncio.Event()
         sse_error_message: list[str | None] = [None]
-        content_order: list[dict[str, Any]] = []
-        image_data_map: dict[str, list[str]] = {}
         current_text_buffer: list[str] = []
-        intercepted_images_dict: dict[str, str] = {}
+        intercepted_image_urls: list[str] = []
+        image_slot_by_id: dict[str, int] = {}
+        image_update_event = asyncio.Event()
+        sse_started_event = asyncio.Event()
+        generation_stream_id: list[str | None] = [None]
+
+        def _signal(event: asyncio.Event):
+            event.set()
+            any_signal_event.set()
 
         async def _telemetry_handler(request):
             try:
                 if "mcs.doubao.com/list" in request.url and request.method == "POST":
                     post_data = request.post_data
                     if post_data and ("rd_flow_message_streaming_finished" in post_data or "message_total_answers_end" in post_data):
-                        generation_complete_event.set()
+                        _signal(generation_complete_event)
             except Exception:
                 pass
 
+        def _record_image_url(url: str):
+            id_match = IMAGE_ID_PATTERN.search(url)
+            if id_match:
+                img_id = id_match.group(1)
+                is_large = "image_pre_watermark" in url
+                slot = image_slot_by_id.get(img_id)
+                if slot is None:
+                    image_slot_by_id[img_id] = len(intercepted_image_urls)
+                    intercepted_image_urls.append(url)
+                    image_update_event.set()
+                else:
+                    if is_large and "downsize_watermark" in intercepted_image_urls[slot]:
+                        intercepted_image_urls[slot] = url
+                        image_update_event.set()
+
+        async def _wait_for_image_links(quiet: float = 1.0, max_wait: float = 3.0):
+            """
+            结束信号之后等待图片链接收齐：已有链接时，连续 quiet 秒无更新即返回；
+            尚无链接时最多等待 max_wait 秒。
+            """
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + max_wait
+            while (remaining := deadline - loop.time()) > 0:
+                image_update_event.clear()
+                timeout = min(quiet, remaining) if intercepted_image_urls else remaining
+                try:
+                    await asyncio.wait_for(image_update_event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    if intercepted_image_urls:
+                        return
+
+        def _collect_image_urls(body: bytes):
+            for raw_url in IMAGE_URL_PATTERN.findall(body):
+                clean_url = raw_url.replace(b"\\/", b"/").replace(b"\\u0026", b"&")
+                _record_image_url(clean_url.decode("utf-8", errors="ignore"))
+
         async def _api_data_interceptor(response):
             try:
                 url = response.url
@@ -591,18 +948,13 @@ class DoubaoImageGenerator:
                     return
 
                 if "rc_gen_image" in url and "http" in url:
-                    id_match = re.search(r'rc_gen_image/([^/~\.]+)', url)
-                    if id_match:
-                        img_id = id_match.group(1)
-                        is_large = "image_pre_watermark" in url
-                        if img_id not in intercepted_images_dict:
-                            intercepted_images_dict[img_id] = url
-                        else:
-                            if is_large and "downsize_watermark" in intercepted_images_dict[img_id]:
-                                intercepted_images_dict[img_id] = url
+                    _record_image_url(url)
+
+                if response.request.resource_type not in API_RESOURCE_TYPES:
+                    return
 
                 content_type = response.headers.get("content-type", "").lower()
-                if not ("application/json" in content_type or "text/event-stream" in content_type):
+                if "application/json" not in content_type:
                     return
                 
                 if "mcs.doubao.com" in url or "monitor_browser" in url or "notice/info" in url:
@@ -610,32 +962,106 @@ class DoubaoImageGenerator:
 
                 try:
                     body_bytes = await response.body()
-                    body_text = body_bytes.decode("utf-8", errors="ignore")
                 except Exception:
                     return
 
-                matches = re.findall(r'(https?://[a-zA-Z0-9\-\.]+\.byteimg\.com[^\s"\'\\]+rc_gen_image/[^\s"\'\\]+)', body_text)
-                
-                for raw_url in matches:
-                    clean_url = raw_url.replace("\\/", "/").replace("\\u0026", "&")
-                    id_match = re.search(r'rc_gen_image/([^/~\.]+)', clean_url)
-                    if id_match:
-                        img_id = id_match.group(1)
-                        is_large = "image_pre_watermark" in clean_url
-                        if img_id not in intercepted_images_dict:
-                            intercepted_images_dict[img_id] = clean_url
-                        else:
-                            if is_large and "downsize_watermark" in intercepted_images_dict[img_id]:
-                                intercepted_images_dict[img_id] = clean_url
+                if SSE_IMAGE_MARKER in body_bytes:
+                    _collect_image_urls(body_bytes)
             except Exception:
                 pass
 
+        # SSE 回调中的热点名称预先绑定为局部引用，避免每个事件重复查找全局变量与属性
+        loads = orjson.loads
+        append_text = current_text_buffer.append
+        set_generation_complete = functools.partial(_signal, generation_complete_event)
+
+        def _handle_sse_payload(payload: bytes):
+            try:
+                if SSE_IMAGE_MARKER in payload:
+                    _collect_image_urls(payload)
+
+                if (
+                    SSE_TEXT_EVENT_MARKER not in payload
+                    and SSE_END_EVENT_MARKER not in payload
+                ):
+                    return
+
+                data = loads(payload)
+                event_type = data.get("event_type")
+
+                if event_type == 2003:
+                    set_generation_complete()
+                    return
+                if event_type != 2001:
+                    return
+
+                # 内层字段是多次转义的JSON字符串，只在可能含有文本时才继续解析
+                raw_event_data = data.get("event_data")
+                if not raw_event_data or "text" not in raw_event_data:
+                    return
+                message_data = loads(raw_event_data).get("message", {})
+                raw_content = message_data.get("content")
+                if not raw_content or "text" not in raw_content:
+                    return
+                content_json = loads(raw_content)
+
+                if raw_text := content_json.get("text"):
+                    repaired_text = _repair_mojibake_text(raw_text)
+                    append_text(repaired_text.replace("\\n", "\n"))
+
+            except (orjson.JSONDecodeError, KeyError) as e:
+                logger.debug(f"跳过无法解析的SSE片段: {e}")
+            except Exception as inner_exc:
+                logger.debug(f"SSE事件处理出现内部错误: {inner_exc}")
+
+        def _route_sse_payload(request_id: str, payload: bytes):
+            """页面上可能有其他事件流，只有首个带 event_type 的流被视为生成流"""
+            if generation_stream_id[0] is None and SSE_EVENT_TYPE_MARKER in payload:
+                generation_stream_id[0] = request_id
+                sse_started_event.set()
+            _handle_sse_payload(payload)
+
+        async def _consume_sse_chunks():
+            """解析任务：从队列取出原始数据块并解析，chunk 为 None 表示该流已结束"""
+            while True:
+                request_id, chunk = await sse_chunks.get()
+                try:
+                    if chunk is not None:
+                        parser = sse_parsers.setdefault(request_id, SSEStreamParser())
+                        for payload in parser.feed(chunk):
+                            _route_sse_payload(request_id, payload)
+                    else:
+                        if parser := sse_parsers.pop(request_id, None):
+                            for payload in parser.close():
+                                _route_sse_payload(request_id, payload)
+                        if request_id == generation_stream_id[0]:
+                            _signal(generation_complete_event)
+                finally:
+                    sse_chunks.task_done()
+
+        def _on_sse_data(request_id: str, chunk: bytes):
+            sse_chunks.put_nowait((request_id, chunk))
+
+        def _on_sse_finished(request_id: str):
+            sse_chunks.put_nowait((request_id, None))
+
+        def _on_sse_error(request_id: str, message: str):
+            sse_parsers.pop(request_id, None)
+            sse_error_message[0] = message
+            _signal(sse_error_event)
+
+        sse_parsers: dict[str, SSEStreamParser] = {}
+        sse_chunks: asyncio.Queue[tuple[str, bytes | None]] = asyncio.Queue()
+        sse_tap = SSEStreamTap(_on_sse_data, _on_sse_finished, _on_sse_error)
+
         async def _local_sse_handler(response):
+            """无法建立CDP会话时的退路：在SSE流结束后整体读取并解析"""
             try:
+                if response.request.resource_type not in API_RESOURCE_TYPES:
+                    return
                 content_type = response.headers.get("content-type", "").lower()
                 if response.status != 200 or "text/event-stream" not in content_type:
                     return
-                    
 
                 try:
                     body_bytes = await response.body()  # type: ignore
@@ -643,61 +1069,37 @@ class DoubaoImageGenerator:
                     if "No data found for resource with given identifier" in str(exc):
                         error_str = f"SSE流中断，可能因内容审核失败或网络问题: {exc}"
                         sse_error_message[0] = error_str
-                        sse_error_event.set()
+                        _signal(sse_error_event)
                     else:
                         logger.warning(f"获取SSE响应体时发生非关键错误: {exc}")
                     return
-                lines = body_bytes.decode("utf-8", errors="ignore").strip().split("\n")
-                for line in lines:
-                    if not line.startswith("data:"):
-                        continue
-
-                    json_str = line[6:].strip()
-                    if not json_str:
-                        continue
-
-                    try:
-                        data = json.loads(json_str)
-                        event_type = data.get("event_type")
-
-                        if event_type == 2003:
-                            generation_complete_event.set()
-                            continue
-                        if event_type != 2001:
-                            continue
-
-                        event_data = json.loads(data.get("event_data", "{}"))
-                        message_data = event_data.get("message", {})
-                        content_json = json.loads(message_data.get("content", "{}"))
-
-                        if raw_text := content_json.get("text"):
-                            repaired_text = self._repair_mojibake_text(raw_text)
-                            current_text_buffer.append(
-                                repaired_text.replace("\\n", "\n")
-                            )
-
-
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.debug(f"跳过无法解析的SSE片段: {e}")
-                    except Exception as inner_exc:
-                        logger.debug(f"SSE事件处理出现内部错误: {inner_exc}")
 
-                generation_complete_event.set()
+                request_id = str(id(response))
+                _on_sse_data(request_id, body_bytes)
+                _on_sse_finished(request_id)
             except Exception as exc:
                 logger.warning(f"SSE拦截器处理响应失败: {exc}")
 
         def _on_page_close(page=None):
             logger.warning("检测到豆包浏览器页面被关闭。")
-            page_closed_event.set()
+            _signal(page_closed_event)
+
+        sse_parser_task = asyncio.create_task(_consume_sse_chunks())
+        sse_streaming = False
+        if self.page and self.context:
+            sse_streaming = await sse_tap.attach(self.context, self.page)
 
         if self.page:
-            self.page.on("response", _local_sse_handler)
+            if not sse_streaming:
+                self.page.on("response", _local_sse_handler)
             self.page.on("response", _api_data_interceptor)
             self.page.on("request", _telemetry_handler)
             self.page.on("close", _on_page_close)
 
         try:
-            if not await self.navigate_to_create_image():
+            if await self._take_warm_page():
+                logger.debug("使用已预热的图片创建页面，跳过导航。")
+            elif not await self.navigate_to_create_image():
                 raise ImageGenerationError("导航到豆包图片创建页面失败")
 
             if check_login:
@@ -711,19 +1113,26 @@ class DoubaoImageGenerator:
 
                 if image_paths:
                     logger.debug(f"检测到 {len(image_paths)} 张图片输入，开始上传...")
+                    upload_started_at = time.monotonic()
                     if not await self._upload_images(image_paths):
                         logger.warning("图片上传失败，继续使用纯文本模式")
                     else:
                         logger.debug("图片上传成功，等待图片处理...")
-                        await asyncio.sleep(5)
+                        await self._wait_for_upload_ready(
+                            len(image_paths), upload_started_at
+                        )
 
                 if not await self._input_prompt(prompt):
                     raise ImageGenerationError("输入提示词失败")
 
+                sse_started_event.clear()
+                generation_stream_id[0] = None
                 if not await self._submit_generation():
                     raise ImageGenerationError("提交生成请求失败")
 
-                captcha_was_handled = await self._handle_captcha_if_present()
+                captcha_was_handled = await self._handle_captcha_if_present(
+                    sse_started_event
+                )
 
                 if captcha_was_handled:
                     logger.info(
@@ -742,7 +1151,7 @@ class DoubaoImageGenerator:
             signal_timeout = int(base_config.get("doubao_wait_signal_timeout", 120))
 
             keep_alive_task = None
-            if self.page:
+            if self.page and base_config.get("DOUBAO_KEEP_ALIVE", False):
                 keep_alive_task = asyncio.create_task(
                     HumanActionUtils.perform_keep_alive(
                         self.page, generation_complete_event
@@ -750,17 +1159,15 @@ class DoubaoImageGenerator:
                 )
 
             try:
-                done, pending = await asyncio.wait(
-                    {
-                        asyncio.create_task(generation_complete_event.wait()),
-                        asyncio.create_task(sse_error_event.wait()),
-                        asyncio.create_task(page_closed_event.wait()),
-                    },
-                    return_when=asyncio.FIRST_COMPLETED,
-                    timeout=signal_timeout,
-                )
-                for task in pending:
-                    task.cancel()
+                any_signal_event.clear()
+                if not (
+                    generation_complete_event.is_set()
+                    or sse_error_event.is_set()
+                    or page_closed_event.is_set()
+                ):
+                    await asyncio.wait_for(
+                        any_signal_event.wait(), timeout=signal_timeout
+                    )
 
                 if page_closed_event.is_set():
                     raise ImageGenerationError(
@@ -770,11 +1177,8 @@ class DoubaoImageGenerator:
                 if sse_error_event.is_set():
                     raise ImageGenerationError(sse_error_message[0])
 
-                if not done:
-                    raise asyncio.TimeoutError
-                else:
-                    logger.debug("✅ 收到豆包SSE流结束信号，额外等待以确保数据完整。")
-                    await asyncio.sleep(3)
+                logger.debug("✅ 收到豆包SSE流结束信号，等待图片链接收齐。")
+                await _wait_for_image_links()
             except asyncio.TimeoutError:
                 logger.warning(
                     f"等待生成完成信号超时 ({signal_timeout}s)。将尝试使用已收到的数据。"
@@ -787,18 +1191,18 @@ class DoubaoImageGenerator:
                     except asyncio.CancelledError:
                         pass
 
+            try:
+                await asyncio.wait_for(sse_chunks.join(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning("等待SSE数据解析完成超时，将使用已解析的内容。")
+
+            structured_result: list[dict[str, Any]] = []
             if current_text_buffer:
-                content_order.append(
+                structured_result.append(
                     {"type": "text", "content": "".join(current_text_buffer)}
                 )
                 current_text_buffer.clear()
 
-            structured_result = []
-            for block in content_order:
-                if block["type"] == "text":
-                    structured_result.append(block)
-
-            intercepted_image_urls = list(intercepted_images_dict.values())
             if intercepted_image_urls:
                 logger.info(f"✨ 成功提取到 {len(intercepted_image_urls)} 张原生高清大图链接")
                 structured_result.append(
@@ -819,8 +1223,11 @@ class DoubaoImageGenerator:
             logger.debug("底层豆包图片生成流程捕获到异常", e=e)
             raise ImageGenerationError(f"{e}") from e
         finally:
+            await sse_tap.detach()
+            sse_parser_task.cancel()
             if self.page:
-                self.page.remove_listener("response", _local_sse_handler)
+                if not sse_streaming:
+                    self.page.remove_listener("response", _local_sse_handler)
                 self.page.remove_listener("response", _api_data_interceptor)
                 self.page.remove_listener("request", _telemetry_handler)
                 try:
@@ -828,115 +1235,96 @@ class DoubaoImageGenerator:
                 except Exception:
                     pass
 
+    async def _fetch_image(self, url: str, index: int) -> dict[str, Any]:
+        """通过浏览器上下文的请求接口下载单张图片（共享页面Cookie与UA）"""
+        if not self.context:
+            return {"url": url, "data": None, "index": index, "error": "浏览器上下文未初始化"}
+
+        try:
+            response = await self.context.request.get(
+                url, headers={"Referer": self.create_image_url}, timeout=60000
+            )
+            try:
+                if not response.ok:
+                    error = f"HTTP {response.status}: {response.status_text}"
+                    return {"url": url, "data": None, "index": index, "error": error}
+                return {"url": url, "data": await response.body(), "index": index}
+            finally:
+                await response.dispose()
+        except Exception as e:
+            return {"url": url, "data": None, "index": index, "error": str(e)}
+
+    async def _save_image(
+        self,
+        download_result: dict[str, Any],
+        filepath: Path,
+        prompt: str,
+        download_time: str,
+    ) -> dict[str, Any]:
+        """将下载到的单张图片写入磁盘，返回图片信息"""
+        image_data = download_result["data"]
+        await asyncio.to_thread(filepath.write_bytes, image_data)
+
+        return {
+            "url": download_result["url"],
+            "local_path": str(filepath),
+            "filename": filepath.name,
+            "size_bytes": len(image_data),
+            "format": "png",
+            "dimensions": {},
+            "index": download_result["index"],
+            "prompt": prompt,
+            "provider": "doubao",
+            "download_time": download_time,
+            "download_method": "browser_request",
+        }
+
     async def _download_images_with_browser(
         self, image_infos: list[dict[str, Any]], prompt: str
     ) -> list[dict[str, Any]]:
         """使用浏览器下载图片（避免403错误）"""
-        if not self.page:
-            logger.error("浏览器页面未初始化")
+        if not self.context:
+            logger.error("浏览器上下文未初始化")
             return []
 
         if not image_infos:
             logger.warning("没有有效的图片信息需要下载")
             return []
 
-        urls_with_index = [
-            {"url": info["url"], "index": info["index"]} for info in image_infos
-        ]
-
-        logger.debug(f"开始批量下载 {len(urls_with_index)} 张图片...")
+        logger.debug(f"开始批量下载 {len(image_infos)} 张图片...")
 
         try:
-            download_results = await self.page.evaluate(
-                """
-                async (urlsWithIndex) => {
-                    // Helper function to convert ArrayBuffer to Base64
-                    const toBase64 = (arrayBuffer) => {
-                        let binary = '';
-                        const bytes = new Uint8Array(arrayBuffer);
-                        const len = bytes.byteLength;
-                        for (let i = 0; i < len; i++) {
-                            binary += String.fromCharCode(bytes[i]);
-                        }
-                        return window.btoa(binary);
-                    };
-
-                    const downloadPromises = urlsWithIndex.map(async (info) => {
-                        try {
-                            const response = await fetch(info.url);
-                            if (!response.ok) {
-                                throw new Error(
-                                    `HTTP ${response.status}: ${response.statusText}`
-                                );
-                            }
-                            const arrayBuffer = await response.arrayBuffer();
-                            const base64Data = toBase64(arrayBuffer);
-                            return {
-                                url: info.url,
-                                data: base64Data,
-                                index: info.index,
-                                success: true
-                            };
-                        } catch (error) {
-                            return {
-                                url: info.url,
-                                data: null,
-                                index: info.index,
-                                success: false,
-                                error: error.message || String(error)
-                            };
-                        }
-                    });
-                    return await Promise.all(downloadPromises);
-                }
-            """,
-                urls_with_index,
+            download_results = await asyncio.gather(
+                *(self._fetch_image(info["url"], info["index"]) for info in image_infos)
             )
 
-            downloaded_images = []
-            import aiofiles
+            download_time = datetime.now().isoformat()
+            batch_id = os.urandom(4).hex()
+            IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+            image_dir = IMAGE_DIR.resolve()
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:8]
-
-            successful_downloads = 0
+            save_tasks = []
             for download_result in download_results:
-                if download_result["success"] and download_result["data"]:
-                    try:
-                        filename = f"doubao_{timestamp}_{prompt_hash}_{download_result['index']}.png"
-                        filepath = IMAGE_DIR / filename
-                        filepath.parent.mkdir(parents=True, exist_ok=True)
-
-                        image_data = base64.b64decode(download_result["data"])
-
-                        async with aiofiles.open(filepath, "wb") as f:
-                            await f.write(image_data)
-
-                        image_result = {
-                            "url": download_result["url"],
-                            "local_path": str(filepath.resolve()),
-                            "filename": filename,
-                            "size_bytes": len(image_data),
-                            "format": "png",
-                            "dimensions": {},
-                            "index": download_result["index"],
-                            "prompt": prompt,
-                            "provider": "doubao",
-                            "download_time": datetime.now().isoformat(),
-                            "download_method": "browser_batch",
-                        }
-
-                        downloaded_images.append(image_result)
-                        successful_downloads += 1
-
-                    except Exception as e:
-                        logger.error(f"保存图片失败: {e}")
-                        continue
+                if download_result["data"]:
+                    filename = f"doubao_{batch_id}_{download_result['index']}.png"
+                    save_tasks.append(
+                        self._save_image(
+                            download_result, image_dir / filename, prompt, download_time
+                        )
+                    )
                 else:
                     logger.warning(
                         f"图片下载失败: {download_result.get('error', '未知错误')}"
                     )
 
+            downloaded_images = []
+            for saved in await asyncio.gather(*save_tasks, return_exceptions=True):
+                if isinstance(saved, BaseException):
+                    logger.error(f"保存图片失败: {saved}")
+                    continue
+                downloaded_images.append(saved)
+            successful_downloads = len(downloaded_images)
+
             logger.debug(
                 f"✅ 批量下载完成，成功保存 "
                 f"{successful_downloads}/{len(image_infos)} 张图片"
@@ -984,7 +1372,6 @@ class DoubaoImageGenerator:
                             image_infos, prompt
                         )
                         if downloaded_images:
-                            downloaded_images.sort(key=lambda img: img.get("index", 99))
                             final_result_blocks.append(
                                 {"type": "image", "content": downloaded_images}
                             )
@@ -1025,19 +1412,16 @@ class DoubaoImageGenerator:
     async def batch_generate_images(
         self, prompts: list[str], delay: float = 3.0
     ) -> list[dict[str, Any]]:
-        """批量生成图片"""
+        """批量生成图片（同一实例只有一个页面，按顺序逐个生成）"""
         results = []
 
         for i, prompt in enumerate(prompts):
+            if i:
+                await asyncio.sleep(delay)
             logger.debug(f"批量生成 {i + 1}/{len(prompts)}: {prompt}")
 
             try:
-                result = await self.generate_image(prompt)
-                results.append(result)
-
-                if i < len(prompts) - 1:
-                    await asyncio.sleep(delay)
-
+                results.append(await self.generate_image(prompt))
             except Exception as e:
                 logger.error(f"批量生成第{i + 1}张图片失败: {e}")
                 results.append(
@@ -1052,5 +1436,3 @@ class DoubaoImageGenerator:
 
         return results
 
-
-image_generator = DoubaoImageGenerator()
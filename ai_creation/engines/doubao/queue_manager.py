@@ -1,14 +1,20 @@
 import asyncio
-from dataclasses import dataclass
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+import itertools
 import time
 from typing import Any
 
 from zhenxun.services.log import logger
 
 from ...config import base_config
-from .generator import DoubaoImageGenerator, ImageGenerationError, CookieInvalidError
+from .browser_pool import BrowserPool
+from .generator import ImageGenerationError, CookieInvalidError
+
+
+MAX_COMPLETED_REQUESTS = 10_000
 
 
 class RequestStatus(Enum):
@@ -21,7 +27,7 @@ class RequestStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class DrawRequest:
     """绘图请求数据类"""
 
@@ -38,138 +44,151 @@ class DrawRequest:
     queue_position: int = 0
     image_paths: list[str] | None = None
     cookie: str | None = None
+    done_event: asyncio.Event = field(
+        default_factory=asyncio.Event, repr=False, compare=False
+    )
+    created_monotonic: float = field(
+        default_factory=time.monotonic, repr=False, compare=False
+    )
+    started_monotonic: float | None = field(default=None, repr=False, compare=False)
+    completed_monotonic: float | None = field(
+        default=None, repr=False, compare=False
+    )
 
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now(timezone.utc).astimezone()
 
+    def mark_started(self):
+        """记录开始处理的时间"""
+        self.started_at = datetime.now(timezone.utc).astimezone()
+        self.started_monotonic = time.monotonic()
+
+    def mark_completed(self):
+        """记录处理结束的时间"""
+        self.completed_at = datetime.now(timezone.utc).astimezone()
+        self.completed_monotonic = time.monotonic()
+
     @property
     def wait_time(self) -> float:
         """实际等待时间（秒）"""
-        if self.started_at and self.created_at:
-            return (self.started_at - self.created_at).total_seconds()
-        elif self.created_at:
-            return (
-                datetime.now(timezone.utc).astimezone() - self.created_at
-            ).total_seconds()
-        return 0.0
+        end = (
+            self.started_monotonic
+            if self.started_monotonic is not None
+            else time.monotonic()
+        )
+        return end - self.created_monotonic
 
     @property
     def processing_time(self) -> float:
         """处理时间（秒）"""
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds()
-        elif self.started_at:
-            return (
-                datetime.now(timezone.utc).astimezone() - self.started_at
-            ).total_seconds()
-        return 0.0
+        if self.started_monotonic is None:
+            return 0.0
+        end = (
+            self.completed_monotonic
+            if self.completed_monotonic is not None
+            else time.monotonic()
+        )
+        return end - self.started_monotonic
 
 
 class DrawQueueManager:
     """AI绘图队列管理器"""
 
     def __init__(self):
-        self._queue: list[DrawRequest] = []
-        self._processing_request: DrawRequest | None = None
-        self._completed_requests: list[DrawRequest] = []
+        self._queue: deque[DrawRequest] = deque()
+        self._processing_requests: dict[str, DrawRequest] = {}
+        self._completed_requests: deque[DrawRequest] = deque()
+        self._requests_by_id: dict[str, DrawRequest] = {}
+        self._user_requests: defaultdict[str, deque[DrawRequest]] = defaultdict(
+            lambda: deque(maxlen=8)
+        )
         self._lock = asyncio.Lock()
-        self._guest_usage_count = 0
-        self.image_generator = DoubaoImageGenerator()
-        self._processing_lock = asyncio.Lock()
+        self._browser_pool = BrowserPool()
+        # 请求序号，保证同一毫秒内提交的请求 ID 也不会重复
+        self._request_seq = itertools.count(1)
 
         self._total_requests = 0
         self._average_processing_time = 60.0
-        self._last_browser_close_time: datetime | None = None
-        self._last_activity_time: datetime | None = None
         self._browser_cooldown_seconds = 180
 
-        self._queue_processor_task: asyncio.Task | None = None
+        self._queue_processor_tasks: list[asyncio.Task] = []
+        self._work_available = asyncio.Event()
         self._idle_monitor_task: asyncio.Task | None = None
         self._shutdown = False
 
         logger.debug("AI绘图队列管理器已初始化")
 
-    async def initialize_browser(self):
-        """初始化常驻浏览器实例"""
-        logger.debug("正在初始化常驻浏览器...")
-        await self.image_generator.initialize()
+    @property
+    def browser_pool_size(self) -> int:
+        """浏览器池容量（即可并发处理的请求数）"""
+        return self._browser_pool.size
+
+    async def set_browser_pool_size(self, size: int):
+        """设置浏览器池容量，需在启动队列处理器之前调用"""
+        await self._browser_pool.resize(size)
+        logger.debug(f"浏览器池容量已设置为 {self._browser_pool.size}")
 
     async def shutdown_browser(self):
-        """关闭常驻浏览器实例"""
-        logger.debug("正在关闭常驻浏览器...")
-        self._last_activity_time = None
-        self._guest_usage_count = 0
-        await self.image_generator.cleanup()
+        """关闭浏览器池中的所有浏览器实例"""
+        logger.debug("正在关闭所有常驻浏览器...")
+        await self._browser_pool.shutdown_all()
 
     def set_browser_cooldown(self, seconds: int):
         """设置浏览器冷却时间"""
         self._browser_cooldown_seconds = seconds
         logger.debug(f"浏览器冷却时间已设置为 {seconds} 秒")
 
-    def set_browser_close_time(self):
-        """记录任务完成时间，并启动浏览器冷却期"""
-        self._last_browser_close_time = datetime.now(timezone.utc).astimezone()
-        logger.info(
-            f"任务处理完成，浏览器进入冷却期 ({self._browser_cooldown_seconds}秒)..."
+    def get_browser_cooldown_remaining(self) -> float:
+        """获取浏览器冷却剩余时间（秒），不在冷却期时为 0"""
+        return self._browser_pool.cooldown_remaining(
+            time.monotonic(), self._browser_cooldown_seconds
         )
 
     def is_browser_in_cooldown(self) -> bool:
         """检查浏览器是否在冷却期"""
-        if not self._last_browser_close_time:
-            return False
-
-        if self._last_browser_close_time:
-            elapsed = (
-                datetime.now(timezone.utc).astimezone() - self._last_browser_close_time
-            ).total_seconds()
-        else:
-            elapsed = 0.0
-        return elapsed < self._browser_cooldown_seconds
-
-    def get_browser_cooldown_remaining(self) -> float:
-        """获取浏览器冷却剩余时间（秒）"""
-        if not self.is_browser_in_cooldown():
-            return 0.0
-
-        if self._last_browser_close_time:
-            elapsed = (
-                datetime.now(timezone.utc).astimezone() - self._last_browser_close_time
-            ).total_seconds()
-        else:
-            elapsed = 0.0
-        return max(0.0, self._browser_cooldown_seconds - elapsed)
+        return self.get_browser_cooldown_remaining() > 0
 
     async def add_request(
         self, user_id: str, prompt: str, image_paths: list[str] | None = None
     ) -> DrawRequest:
         """添加绘图请求到队列"""
+        if not self.is_queue_processor_running:
+            logger.warning("队列处理器未运行，绘图请求将在处理器启动后才会被处理。")
+
         async with self._lock:
-            self._last_activity_time = datetime.now(timezone.utc).astimezone()
-            request_id = f"{user_id}_{int(time.time() * 1000)}"
+            now = datetime.now(timezone.utc).astimezone()
+            request_id = (
+                f"{user_id}_{int(now.timestamp() * 1000)}_{next(self._request_seq)}"
+            )
 
+            pool_size = self._browser_pool.size
             queue_position = len(self._queue)
-            estimated_wait = queue_position * self._average_processing_time
+            estimated_wait = (
+                queue_position * self._average_processing_time / pool_size
+            )
 
-            if self._processing_request:
-                estimated_wait += max(
-                    0,
-                    self._average_processing_time
-                    - self._processing_request.processing_time,
+            if len(self._processing_requests) >= pool_size:
+                estimated_wait += min(
+                    max(0, self._average_processing_time - req.processing_time)
+                    for req in self._processing_requests.values()
                 )
 
-            if self.is_browser_in_cooldown():
-                estimated_wait += self.get_browser_cooldown_remaining()
+            estimated_wait += self.get_browser_cooldown_remaining()
 
             request = DrawRequest(
                 request_id=request_id,
                 user_id=user_id,
                 prompt=prompt,
+                created_at=now,
                 estimated_wait_time=estimated_wait,
                 image_paths=image_paths,
             )
 
             self._queue.append(request)
+            self._work_available.set()
+            self._requests_by_id[request_id] = request
+            self._user_requests[user_id].append(request)
             self._total_requests += 1
 
             actual_position = len(self._queue)
@@ -188,10 +207,10 @@ class DrawQueueManager:
             if not self._queue:
                 return None
 
-            request = self._queue.pop(0)
+            request = self._queue.popleft()
             request.status = RequestStatus.PROCESSING
-            request.started_at = datetime.now(timezone.utc).astimezone()
-            self._processing_request = request
+            request.mark_started()
+            self._processing_requests[request.request_id] = request
 
             logger.debug(f"开始处理请求 {request.request_id}")
             return request
@@ -200,7 +219,7 @@ class DrawQueueManager:
         """完成请求处理"""
         async with self._lock:
             request.status = RequestStatus.COMPLETED
-            request.completed_at = datetime.now(timezone.utc).astimezone()
+            request.mark_completed()
             request.result = result
 
             processing_time = request.processing_time
@@ -209,8 +228,9 @@ class DrawQueueManager:
                     self._average_processing_time * 0.8 + processing_time * 0.2
                 )
 
-            self._completed_requests.append(request)
-            self._processing_request = None
+            self._archive_request(request)
+            self._processing_requests.pop(request.request_id, None)
+            request.done_event.set()
 
             if request.cookie:
                 from .cookie_manager import cookie_manager
@@ -220,128 +240,107 @@ class DrawQueueManager:
             logger.debug(
                 f"请求 {request.request_id} 处理完成，耗时: {processing_time:.1f}秒"
             )
-            self.set_browser_close_time()
-            self._last_activity_time = datetime.now(timezone.utc).astimezone()
 
     async def fail_request(self, request: DrawRequest, error: str):
         """标记请求失败"""
         async with self._lock:
             request.status = RequestStatus.FAILED
-            request.completed_at = datetime.now(timezone.utc).astimezone()
+            request.mark_completed()
             request.error = error
 
-            self._completed_requests.append(request)
-            self._processing_request = None
+            self._archive_request(request)
+            self._processing_requests.pop(request.request_id, None)
+            request.done_event.set()
 
             logger.error(f"请求 {request.request_id} 处理失败: {error}")
-            self.set_browser_close_time()
-            self._last_activity_time = datetime.now(timezone.utc).astimezone()
 
     async def cancel_request(self, request_id: str) -> bool:
         """取消请求"""
         async with self._lock:
-            for i, request in enumerate(self._queue):
-                if request.request_id == request_id:
-                    request.status = RequestStatus.CANCELLED
-                    self._queue.pop(i)
-                    self._completed_requests.append(request)
-                    logger.debug(f"请求 {request_id} 已取消")
-                    return True
-
-            if (
-                self._processing_request
-                and self._processing_request.request_id == request_id
-            ):
-                logger.warning(f"请求 {request_id} 正在处理中，无法取消")
+            request = self._requests_by_id.get(request_id)
+            if not request:
                 return False
 
+            if request.status == RequestStatus.PENDING:
+                request.status = RequestStatus.CANCELLED
+                request.mark_completed()
+                self._queue.remove(request)
+                self._archive_request(request)
+                request.done_event.set()
+                logger.debug(f"请求 {request_id} 已取消")
+                return True
+
+            if request.status == RequestStatus.PROCESSING:
+                logger.warning(f"请求 {request_id} 正在处理中，无法取消")
+
             return False
 
     def get_queue_status(self) -> dict[str, Any]:
         """获取队列状态"""
+        cooldown_remaining = self.get_browser_cooldown_remaining()
         return {
             "queue_length": len(self._queue),
-            "processing_request": self._processing_request.request_id
-            if self._processing_request
-            else None,
+            "processing_requests": list(self._processing_requests),
+            "browser_pool_size": self._browser_pool.size,
             "total_requests": self._total_requests,
             "average_processing_time": self._average_processing_time,
-            "browser_in_cooldown": self.is_browser_in_cooldown(),
-            "browser_cooldown_remaining": self.get_browser_cooldown_remaining(),
+            "browser_in_cooldown": cooldown_remaining > 0,
+            "browser_cooldown_remaining": cooldown_remaining,
         }
 
     def get_user_queue_position(self, user_id: str) -> int | None:
         """获取用户在队列中的位置（返回最新请求的位置）"""
-        last_position = None
-        for i, request in enumerate(self._queue):
-            if request.user_id == user_id:
-                last_position = i + 1
-        return last_position
-
-    def get_user_request_status(self, user_id: str) -> DrawRequest | None:
-        """获取用户最新的请求状态"""
-        if self._processing_request and self._processing_request.user_id == user_id:
-            return self._processing_request
-
-        for request in self._queue:
-            if request.user_id == user_id:
-                return request
-
-        for request in reversed(self._completed_requests[-10:]):
-            if request.user_id == user_id:
-                return request
+        user_requests = self._user_requests.get(user_id)
+        if not user_requests:
+            return None
 
+        for request in reversed(user_requests):
+            if request.status == RequestStatus.PENDING:
+                return self._queue.index(request) + 1
         return None
 
-    async def wait_for_request_completion(
-        self, request_id: str, timeout: float = 300.0
-    ) -> DrawRequest | None:
-        """等待特定请求完成"""
-        start_time = asyncio.get_event_loop().time()
-
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
-            for req in self._completed_requests:
-                if req.request_id == request_id:
-                    return req
-
-            if (
-                self._processing_request
-                and self._processing_request.request_id == request_id
-            ):
-                await asyncio.sleep(1)
-                continue
+    def get_user_request_status(self, user_id: str) -> DrawRequest | None:
+        """获取用户的请求状态：优先处理中的请求，其次最早排队的请求，最后是最近结束的请求"""
+        user_requests = self._user_requests.get(user_id)
+        if not user_requests:
+            return None
 
-            for req in self._queue:
-                if req.request_id == request_id:
-                    await asyncio.sleep(1)
-                    break
-            else:
-                return None
+        for status in (RequestStatus.PROCESSING, RequestStatus.PENDING):
+            for request in user_requests:
+                if request.status == status:
+                    return request
 
-        return None
+        return user_requests[-1]
 
     async def process_queue_once(self):
-        """处理队列中的一个请求（如果有的话）"""
-        async with self._processing_lock:
-            while self.is_browser_in_cooldown():
-                cooldown_remaining = self.get_browser_cooldown_remaining()
+        """借用一个空闲浏览器，处理队列中的一个请求（如果有的话）"""
+        async with self._browser_pool.acquire() as slot:
+            while (
+                cooldown_remaining := slot.cooldown_remaining(
+                    time.monotonic(), self._browser_cooldown_seconds
+                )
+            ) > 0:
                 logger.debug(
-                    f"队列处理器等待浏览器冷却结束，剩余 {cooldown_remaining:.1f}秒"
+                    f"浏览器 #{slot.slot_id} 等待冷却结束，剩余 {cooldown_remaining:.1f}秒"
                 )
                 await asyncio.sleep(min(5, cooldown_remaining))
 
-            if not self.image_generator.is_initialized:
-                logger.warning("检测到浏览器未初始化，正在尝试启动...")
-                await self.initialize_browser()
-                if not self.image_generator.is_initialized:
-                    logger.error("浏览器启动失败，无法处理任务。")
-                    async with self._lock:
-                        for req in self._queue:
-                            req.status = RequestStatus.FAILED
-                            req.error = "浏览器未能成功初始化，无法执行任务。"
-                            self._completed_requests.append(req)
-                        self._queue.clear()
-                    return None
+            if not self._queue:
+                return None
+
+            if not slot.is_initialized:
+                logger.warning(
+                    f"检测到浏览器 #{slot.slot_id} 未初始化，正在尝试启动..."
+                )
+                await slot.initialize()
+                if not slot.is_initialized:
+                    logger.error(f"浏览器 #{slot.slot_id} 启动失败，无法处理任务。")
+                    failed_request = await self.get_next_request()
+                    if failed_request:
+                        await self.fail_request(
+                            failed_request, "浏览器未能成功初始化，无法执行任务。"
+                        )
+                    return failed_request
 
             current_request = await self.get_next_request()
             if not current_request:
@@ -349,107 +348,160 @@ class DrawQueueManager:
 
             from .cookie_manager import cookie_manager
 
-            while True:
-                try:
+            cookies_enabled = bool(base_config.get("ENABLE_DOUBAO_COOKIES"))
 
-                    use_cookies = (
-                        base_config.get("ENABLE_DOUBAO_COOKIES")
-                        and cookie_manager.get_total_cookie_count() > 0
-                    )
+            try:
+                while True:
+                    try:
+                        use_cookies = (
+                            cookies_enabled
+                            and cookie_manager.get_total_cookie_count() > 0
+                        )
 
-                    selected_cookie = None
-                    if use_cookies:
-                        selected_cookie = await cookie_manager.get_next_cookie()
-                        if not selected_cookie:
-                            logger.warning(
-                                "🍪 所有可用Cookie额度已用尽或已失效，将尝试使用无Cookie模式。"
+                        selected_cookie = None
+                        if use_cookies:
+                            selected_cookie = await cookie_manager.get_next_cookie(
+                                exclude=self._cookies_in_use()
                             )
+                            if not selected_cookie:
+                                logger.warning(
+                                    "🍪 所有可用Cookie额度已用尽或已失效，将尝试使用无Cookie模式。"
+                                )
+
+                        current_request.cookie = selected_cookie
+                        await slot.generator.update_session_cookie(selected_cookie)
+
+                        result = await slot.generator.generate_image(
+                            prompt=current_request.prompt,
+                            count=1,
+                            image_paths=current_request.image_paths,
+                            check_login=bool(selected_cookie),
+                        )
 
-                    current_request.cookie = selected_cookie
-                    await self.image_generator.update_session_cookie(selected_cookie)
-
-                    result = await self.image_generator.generate_image(
-                        prompt=current_request.prompt,
-                        count=1,
-                        image_paths=current_request.image_paths,
-                        check_login=bool(selected_cookie),
-                    )
-
-                    if result.get("success"):
-                        is_guest_draw = not current_request.cookie
-                        if is_guest_draw:
-                            self._guest_usage_count += 1
-                            logger.info(
-                                f"无Cookie模式使用次数: {self._guest_usage_count}/5"
+                        if result.get("success"):
+                            is_guest_draw = not current_request.cookie
+                            if is_guest_draw:
+                                slot.guest_usage_count += 1
+                                logger.info(
+                                    f"浏览器 #{slot.slot_id} 无Cookie模式使用次数: "
+                                    f"{slot.guest_usage_count}/5"
+                                )
+
+                            await self.complete_request(current_request, result)
+
+                            if is_guest_draw and slot.guest_usage_count >= 5:
+                                logger.info(
+                                    "无Cookie模式已达5次上限，将在本次任务完成后立即关闭浏览器。"
+                                )
+                                await slot.shutdown()
+                            elif not is_guest_draw:
+                                next_cookie = cookie_manager.peek_next_cookie(
+                                    exclude=self._cookies_in_use()
+                                )
+                                slot.generator.prewarm_page(next_cookie)
+                            break
+                        else:
+                            error_msg = result.get("error", "未知生成错误")
+                            await self.fail_request(current_request, error_msg)
+                            break
+
+                    except CookieInvalidError:
+                        if current_request.cookie:
+                            logger.error(
+                                "🚫 检测到当前Cookie已失效，正在标记并自动切换下一个..."
                             )
-
-                        await self.complete_request(current_request, result)
-
-                        if is_guest_draw and self._guest_usage_count >= 5:
-                            logger.info(
-                                "无Cookie模式已达5次上限，将在本次任务完成后立即关闭浏览器。"
+                            await cookie_manager.mark_cookie_invalid(
+                                current_request.cookie
                             )
-                            await self.shutdown_browser()
-                        break
-                    else:
-                        error_msg = result.get("error", "未知生成错误")
-                        await self.fail_request(current_request, error_msg)
-                        break
+                            await slot.shutdown()
+                            continue
+                        else:
+                            await self.fail_request(
+                                current_request, "游客模式检测到异常状态"
+                            )
+                            break
 
-                except CookieInvalidError:
-                    if current_request.cookie:
-                        logger.error(
-                            "🚫 检测到当前Cookie已失效，正在标记并自动切换下一个..."
-                        )
-                        await cookie_manager.mark_cookie_invalid(current_request.cookie)
-                        await self.shutdown_browser()
-                        continue
-                    else:
-                        await self.fail_request(
-                            current_request, "游客模式检测到异常状态"
-                        )
+                    except (ImageGenerationError, RuntimeError) as e:
+                        logger.error(f"图片生成发生可恢复错误: {e}")
+                        logger.error("发生运行时错误，将关闭浏览器实例以待下次自愈...")
+                        await slot.shutdown()
+                        await self.fail_request(current_request, str(e))
                         break
-
-                except (ImageGenerationError, RuntimeError) as e:
-                    logger.error(f"图片生成发生可恢复错误: {e}")
-                    logger.error("发生运行时错误，将关闭浏览器实例以待下次自愈...")
-                    await self.shutdown_browser()
-                    await self.fail_request(current_request, str(e))
-                    break
-                except Exception as e:
-                    await self.fail_request(current_request, str(e))
-                    logger.error("发生严重未知错误，将关闭浏览器实例以待下次重启...")
-                    await self.shutdown_browser()
-                    break
+                    except Exception as e:
+                        await self.fail_request(current_request, str(e))
+                        logger.error("发生严重未知错误，将关闭浏览器实例以待下次重启...")
+                        await slot.shutdown()
+                        break
+            finally:
+                slot.last_release_time = time.monotonic()
+                slot.last_activity_time = slot.last_release_time
+                logger.info(
+                    f"任务处理完成，浏览器 #{slot.slot_id} 进入冷却期 "
+                    f"({self._browser_cooldown_seconds}秒)..."
+                )
 
             return current_request
 
+    def _cookies_in_use(self) -> set[str]:
+        """获取正在被其他浏览器使用的Cookie"""
+        return {
+            req.cookie for req in self._processing_requests.values() if req.cookie
+        }
+
     async def cleanup_old_requests(self, max_age_hours: int = 24):
         """清理旧的已完成请求"""
         async with self._lock:
             cutoff_time = datetime.now(timezone.utc).astimezone() - timedelta(
                 hours=max_age_hours
             )
-            original_count = len(self._completed_requests)
-
-            self._completed_requests = [
-                req
-                for req in self._completed_requests
-                if req.completed_at and req.completed_at > cutoff_time
-            ]
+            cleaned_count = 0
+            while self._completed_requests:
+                oldest = self._completed_requests[0]
+                if oldest.completed_at and oldest.completed_at > cutoff_time:
+                    break
+                self._forget_request(self._completed_requests.popleft())
+                cleaned_count += 1
 
-            cleaned_count = original_count - len(self._completed_requests)
             if cleaned_count > 0:
                 logger.debug(f"清理了 {cleaned_count} 个旧的请求记录")
 
+    def _archive_request(self, request: DrawRequest):
+        """将已结束的请求按结束时间顺序加入历史记录，超出上限时淘汰最旧的记录"""
+        if len(self._completed_requests) >= MAX_COMPLETED_REQUESTS:
+            self._forget_request(self._completed_requests.popleft())
+        self._completed_requests.append(request)
+
+    def _forget_request(self, request: DrawRequest):
+        """从索引中移除一个已结束的请求"""
+        self._requests_by_id.pop(request.request_id, None)
+        user_requests = self._user_requests.get(request.user_id)
+        if user_requests is None:
+            return
+        if request in user_requests:
+            user_requests.remove(request)
+        if not user_requests:
+            del self._user_requests[request.user_id]
+
+    @property
+    def is_queue_processor_running(self) -> bool:
+        """队列处理器是否有工作协程在运行"""
+        return any(not task.done() for task in self._queue_processor_tasks)
+
     def start_queue_processor(self):
-        """启动队列处理器"""
-        if self._queue_processor_task is None or self._queue_processor_task.done():
-            self._shutdown = False
-            self._queue_processor_task = asyncio.create_task(
-                self._queue_processor_loop()
+        """启动队列处理器（浏览器池中每个浏览器对应一个工作协程）"""
+        self._queue_processor_tasks = [
+            task for task in self._queue_processor_tasks if not task.done()
+        ]
+        missing_workers = self._browser_pool.size - len(self._queue_processor_tasks)
+        if missing_workers <= 0:
+            return
+
+        self._shutdown = False
+        for _ in range(missing_workers):
+            self._queue_processor_tasks.append(
+                asyncio.create_task(self._queue_processor_loop())
             )
-            logger.debug("队列处理器已启动")
+        logger.debug(f"队列处理器已启动 ({len(self._queue_processor_tasks)} 个工作协程)")
 
     def start_idle_monitor(self):
         """启动浏览器闲置监控器"""
@@ -474,36 +526,42 @@ class DrawQueueManager:
         while not self._shutdown:
             await asyncio.sleep(30)
 
+            await self.cleanup_old_requests()
+
             timeout_minutes = base_config.get("browser_idle_timeout_minutes", 10)
             if timeout_minutes <= 0:
                 continue
 
-            if (
-                not self.image_generator.is_initialized
-                or self._queue
-                or self._processing_request
-            ):
+            if self._queue:
                 continue
 
-            if self._last_activity_time:
-                idle_seconds = (
-                    datetime.now(timezone.utc).astimezone() - self._last_activity_time
-                ).total_seconds()
-                if idle_seconds > timeout_minutes * 60:
+            now = time.monotonic()
+            for slot in self._browser_pool.slots:
+                if (
+                    not slot.is_initialized
+                    or slot.in_use
+                    or slot.last_activity_time is None
+                ):
+                    continue
+
+                if now - slot.last_activity_time > timeout_minutes * 60:
                     logger.info(
-                        f"浏览器闲置超过 {timeout_minutes} 分钟，将自动关闭以释放资源。"
+                        f"浏览器 #{slot.slot_id} 闲置超过 {timeout_minutes} 分钟，"
+                        "将自动关闭以释放资源。"
                     )
-                    await self.shutdown_browser()
+                    await slot.shutdown()
 
     async def stop_queue_processor(self):
         """停止队列处理器"""
         self._shutdown = True
-        if self._queue_processor_task and not self._queue_processor_task.done():
-            self._queue_processor_task.cancel()
-            try:
-                await self._queue_processor_task
-            except asyncio.CancelledError:
-                pass
+        running_tasks = [
+            task for task in self._queue_processor_tasks if not task.done()
+        ]
+        self._queue_processor_tasks = []
+        if running_tasks:
+            for task in running_tasks:
+                task.cancel()
+            await asyncio.gather(*running_tasks, return_exceptions=True)
             logger.debug("队列处理器已停止")
 
     async def _queue_processor_loop(self):
@@ -511,10 +569,11 @@ class DrawQueueManager:
         logger.debug("队列处理器主循环已启动")
         while not self._shutdown:
             try:
-                if self._queue:
-                    await self.process_queue_once()
-                else:
-                    await asyncio.sleep(1)
+                if not self._queue:
+                    self._work_available.clear()
+                    await self._work_available.wait()
+                    continue
+                await self.process_queue_once()
             except Exception as e:
                 logger.error(f"队列处理器发生错误: {e}")
                 await asyncio.sleep(5)
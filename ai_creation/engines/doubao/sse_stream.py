@@ -0,0 +1,216 @@
+import base64
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from playwright.async_api import BrowserContext, CDPSession, Page
+
+from zhenxun.services.log import logger
+
+SSE_WHITESPACE = b" \t\r"
+
+
+class SSEStreamParser:
+    """增量解析 text/event-stream 字节流，逐块产出每个 data: 行的负载"""
+
+    def __init__(self):
+        self._pending: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """追加一段数据，返回其中已完整到达的 data: 负载"""
+        line_end = chunk.find(b"\n")
+        if line_end == -1:
+            if chunk:
+                self._pending.append(chunk)
+            return []
+
+        payloads: list[bytes] = []
+        if self._pending:
+            self._pending.append(chunk[:line_end])
+            first_line = b"".join(self._pending)
+            self._pending.clear()
+            payload = self._extract_payload(first_line, 0, len(first_line))
+        else:
+            payload = self._extract_payload(chunk, 0, line_end)
+        if payload:
+            payloads.append(payload)
+
+        line_start = line_end + 1
+        while (line_end := chunk.find(b"\n", line_start)) != -1:
+            if payload := self._extract_payload(chunk, line_start, line_end):
+                payloads.append(payload)
+            line_start = line_end + 1
+
+        if line_start < len(chunk):
+            self._pending.append(chunk[line_start:])
+        return payloads
+
+    def close(self) -> list[bytes]:
+        """流结束时处理最后一行未以换行结尾的数据"""
+        line = b"".join(self._pending)
+        self._pending.clear()
+        payload = self._extract_payload(line, 0, len(line))
+        return [payload] if payload else []
+
+    @staticmethod
+    def _extract_payload(buffer: bytes, start: int, end: int) -> bytes | None:
+        """取出 buffer[start:end] 这一行的 data: 负载；边界先在原缓冲区上计算，只切片一次"""
+        if not buffer.startswith(b"data:", start, end):
+            return None
+        start += 5
+        while start < end and buffer[start] in SSE_WHITESPACE:
+            start += 1
+        while end > start and buffer[end - 1] in SSE_WHITESPACE:
+            end -= 1
+        return buffer[start:end] if start < end else None
+
+
+@dataclass
+class _StreamState:
+    live: bool = False
+    finished: bool = False
+    pending: list[bytes] = field(default_factory=list)
+
+
+class SSEStreamTap:
+    """
+    通过 CDP 增量读取页面中 text/event-stream 响应的数据。
+    Playwright 的 response.body() 只能在流关闭后一次性拿到完整内容，
+    这里借助 Network.streamResourceContent 在数据到达时立即回调。
+    """
+
+    def __init__(
+        self,
+        on_data: Callable[[str, bytes], None],
+        on_finished: Callable[[str], None],
+        on_error: Callable[[str, str], None],
+    ):
+        self._on_data = on_data
+        self._on_finished = on_finished
+        self._on_error = on_error
+        self._session: CDPSession | None = None
+        self._streams: dict[str, _StreamState] = {}
+        self._buffered_requests: set[str] = set()
+
+    @property
+    def is_attached(self) -> bool:
+        return self._session is not None
+
+    async def attach(self, context: BrowserContext, page: Page) -> bool:
+        """为页面建立 CDP 会话并开始监听网络事件，失败时返回 False"""
+        try:
+            session = await context.new_cdp_session(page)
+            await session.send("Network.enable")
+        except Exception as e:
+            logger.debug(f"无法建立CDP会话，SSE将退回整体读取模式: {e}")
+            return False
+
+        session.on("Network.responseReceived", self._on_response_received)
+        session.on("Network.dataReceived", self._on_data_received)
+        session.on("Network.loadingFinished", self._on_loading_finished)
+        session.on("Network.loadingFailed", self._on_loading_failed)
+        self._session = session
+        return True
+
+    async def detach(self):
+        """断开 CDP 会话"""
+        session, self._session = self._session, None
+        self._streams.clear()
+        self._buffered_requests.clear()
+        if session is None:
+            return
+        try:
+            await session.detach()
+        except Exception as e:
+            logger.debug(f"断开CDP会话时出现非关键错误: {e}")
+
+    async def _on_response_received(self, params: dict):
+        response = params.get("response", {})
+        if response.get("status") != 200:
+            return
+        if "text/event-stream" not in response.get("mimeType", "").lower():
+            return
+        if self._session is None:
+            return
+
+        request_id = params["requestId"]
+        state = self._streams[request_id] = _StreamState()
+        try:
+            result = await self._session.send(
+                "Network.streamResourceContent", {"requestId": request_id}
+            )
+        except Exception as e:
+            logger.debug(f"浏览器不支持SSE流式读取，将在流结束后整体读取: {e}")
+            self._streams.pop(request_id, None)
+            self._buffered_requests.add(request_id)
+            if state.finished:
+                await self._read_buffered_body(request_id)
+            return
+
+        if buffered := result.get("bufferedData"):
+            self._on_data(request_id, base64.b64decode(buffered))
+        for chunk in state.pending:
+            self._on_data(request_id, chunk)
+        state.pending.clear()
+        state.live = True
+
+        if state.finished:
+            self._streams.pop(request_id, None)
+            self._on_finished(request_id)
+
+    def _on_data_received(self, params: dict):
+        state = self._streams.get(params["requestId"])
+        if state is None or not (data := params.get("data")):
+            return
+        chunk = base64.b64decode(data)
+        if state.live:
+            self._on_data(params["requestId"], chunk)
+        else:
+            state.pending.append(chunk)
+
+    async def _on_loading_finished(self, params: dict):
+        request_id = params["requestId"]
+        if request_id in self._buffered_requests:
+            await self._read_buffered_body(request_id)
+            return
+
+        state = self._streams.get(request_id)
+        if state is None:
+            return
+        if state.live:
+            self._streams.pop(request_id, None)
+            self._on_finished(request_id)
+        else:
+            state.finished = True
+
+    def _on_loading_failed(self, params: dict):
+        request_id = params["requestId"]
+        self._buffered_requests.discard(request_id)
+        if self._streams.pop(request_id, None) is None:
+            return
+        error_text = params.get("errorText", "未知错误")
+        self._on_error(request_id, f"SSE流中断，可能因内容审核失败或网络问题: {error_text}")
+
+    async def _read_buffered_body(self, request_id: str):
+        """不支持流式读取时，在流结束后通过 getResponseBody 整体读取"""
+        self._buffered_requests.discard(request_id)
+        if self._session is None:
+            return
+        try:
+            result = await self._session.send(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except Exception as e:
+            if "No data found for resource with given identifier" in str(e):
+                self._on_error(
+                    request_id, f"SSE流中断，可能因内容审核失败或网络问题: {e}"
+                )
+            else:
+                logger.warning(f"获取SSE响应体时发生非关键错误: {e}")
+            return
+
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            self._on_data(request_id, base64.b64decode(body))
+        else:
+            self._on_data(request_id, body.encode("utf-8"))
+        self._on_finished(request_id)
@@ -448,13 +448,18 @@ class DrawingService:
             from ..engines.doubao.queue_manager import draw_queue_manager
 
             queue_len = len(draw_queue_manager._queue)
-            is_processing = draw_queue_manager._processing_request is not None
+            processing_count = len(draw_queue_manager._processing_requests)
+            pool_size = draw_queue_manager.browser_pool_size
             cooldown_remaining = draw_queue_manager.get_browser_cooldown_remaining()
 
-            if cooldown_remaining > 0 or queue_len > 0 or is_processing:
-                tasks_ahead = queue_len + (1 if is_processing else 0)
+            if (
+                cooldown_remaining > 0
+                or queue_len > 0
+                or processing_count >= pool_size
+            ):
+                tasks_ahead = queue_len + processing_count
                 wait_time = (
-                    tasks_ahead * draw_queue_manager._average_processing_time
+                    tasks_ahead * draw_queue_manager._average_processing_time / pool_size
                 ) + cooldown_remaining
                 queue_message = (
                     f"⏳ 任务已加入队列，您前面还有 {tasks_ahead} 个任务，"
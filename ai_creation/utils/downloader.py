@@ -25,7 +25,7 @@ class ImageDownloader:
         """生成图片文件名"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        url_hash = hashlib.md5(image_info["url"].encode()).hexdigest()[:8]
+        url_hash = hashlib.blake2b(image_info["url"].encode(), digest_size=4).hexdigest()
 
         format_ext = {
             "jpeg": ".jpg",
@@ -0,0 +1,39 @@
+import time
+from typing import Any
+
+from zhenxun.utils.limiters import FreqLimiter
+
+
+class PrunedFreqLimiter(FreqLimiter):
+    """会定期清理过期冷却记录的 FreqLimiter，避免记录随用户数无限增长"""
+
+    PRUNE_EVERY_CHECKS = 1000
+    PRUNE_EVERY_SECONDS = 300
+
+    def __init__(self, default_cd_seconds: int):
+        super().__init__(default_cd_seconds)
+        self._checks_since_prune = 0
+        self._last_prune = time.time()
+
+    def check(self, key: Any) -> bool:
+        self._checks_since_prune += 1
+        now = time.time()
+        if (
+            self._checks_since_prune >= self.PRUNE_EVERY_CHECKS
+            or now - self._last_prune >= self.PRUNE_EVERY_SECONDS
+        ):
+            self._prune(now)
+        return super().check(key)
+
+    def _prune(self, now: float):
+        """删除冷却结束已超过两个冷却周期的记录"""
+        self._checks_since_prune = 0
+        self._last_prune = now
+
+        next_time = getattr(self, "next_time", None)
+        if not isinstance(next_time, dict):
+            return
+
+        expire_before = now - 2 * self.default_cd
+        for key in [key for key, t in next_time.items() if t < expire_before]:
+            del next_time[key]